@@ -0,0 +1,95 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+# upper bound on the token cache TTL when the cache is per-process (LocMem): other
+# workers cannot see evictions, so a revoked token stays valid there until expiry
+LOCAL_CACHE_MAX_TTL = 5
+
+
+def token_cache_ttl():
+    ttl = getattr(settings, "TOKEN_AUTH_CACHE_TTL", 0)
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend.endswith(("LocMemCache", "DummyCache")):
+        ttl = min(ttl, LOCAL_CACHE_MAX_TTL)
+    return ttl
+
+
+def token_cache_key(key):
+    # never put raw token keys into the cache backend
+    return "accounts:token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget_token(key):
+    cache.delete(token_cache_key(key))
+
+
+def forget_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list("key", flat=True):
+        forget_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    DRF TokenAuthentication that keeps the Token (with its user) in Django's
+    cache for TOKEN_AUTH_CACHE_TTL seconds, so repeat requests skip the
+    token/user join; request.auth is the Token either way. Entries are
+    dropped on logout, token deletion and user saves (see Accounts.signals),
+    which only reaches every worker through a shared cache (Redis,
+    Memcached): with the per-process LocMem cache the TTL is capped at
+    LOCAL_CACHE_MAX_TTL seconds, and check Accounts.W001 warns about it.
+    """
+
+    def authenticate_credentials(self, key):
+        ttl = token_cache_ttl()
+        cache_key = token_cache_key(key)
+
+        if ttl:
+            token = cache.get(cache_key)
+            if token is not None and token.user.is_active:
+                return (token.user, token)
+
+        user, token = super().authenticate_credentials(key)
+        if ttl:
+            cache.set(cache_key, token, ttl)
+        return (user, token)
+
+
+# -------------------------
+# Optional stateless mode (AUTH_TOKEN_MODE = "jwt")
+# -------------------------
+JWT_USER_CLAIMS = ("username", "email", "first_name", "last_name")
+
+
+def jwt_enabled():
+    return getattr(settings, "AUTH_TOKEN_MODE", "token") == "jwt"
+
+
+def issue_jwt(user):
+    """Signed access/refresh pair carrying the profile fields `me` returns."""
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    refresh = RefreshToken.for_user(user)
+    for claim in JWT_USER_CLAIMS:
+        refresh[claim] = getattr(user, claim) or ""
+    return {"token": str(refresh.access_token), "refresh": str(refresh)}
+
+
+def issue_token(user):
+    """Login/register response credentials for the configured token mode."""
+    if jwt_enabled():
+        return issue_jwt(user)
+    token, _ = Token.objects.get_or_create(user=user)
+    return {"token": token.key}
+
+
+def me_authentication_classes():
+    classes = [CachedTokenAuthentication]
+    if jwt_enabled():
+        from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+        classes.insert(0, JWTStatelessUserAuthentication)
+    return classes
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashers import hash_password, needs_rehash, verify_password
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that verifies passwords on the bounded hash pool and
+    upgrades hashes made with an older hasher or work factor.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # hash anyway so unknown usernames take as long as wrong passwords
+            hash_password(password)
+            return None
+
+        if not (verify_password(password, user.password) and self.user_can_authenticate(user)):
+            return None
+
+        if needs_rehash(user.password):
+            user.password = hash_password(password)
+            user.save(update_fields=["password"])
+        return user
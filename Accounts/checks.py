@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def token_cache_check(app_configs, **kwargs):
+    """The token cache is only revoked everywhere when the cache is shared between workers."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if not backend.endswith(("LocMemCache", "DummyCache")):
+        return []
+    if not (getattr(settings, "TOKEN_AUTH_CACHE_TTL", 0) or not settings.DEBUG):
+        return []
+    return [
+        Warning(
+            "CachedTokenAuthentication needs a shared cache backend.",
+            hint=(
+                f"CACHES['default'] is {backend.rsplit('.', 1)[-1]}, which is per-process: a logout or "
+                "password change only evicts tokens in the worker that handled it, so the token cache "
+                "is off (TOKEN_AUTH_CACHE_TTL=0) or capped at a few seconds. Set CACHE_BACKEND / "
+                "CACHE_LOCATION to Redis or Memcached."
+            ),
+            id="Accounts.W001",
+        )
+    ]
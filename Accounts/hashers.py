@@ -0,0 +1,141 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the work factor taken from PASSWORD_PBKDF2_ITERATIONS.
+    Changing the setting upgrades stored hashes on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
+
+
+# -------------------------
+# Bounded hashing pool
+# -------------------------
+class HashPoolBusy(Exception):
+    """Raised when too many password hashes are already queued."""
+
+
+class HashPool:
+    """
+    Runs password hashing on a fixed number of threads (hashlib, scrypt and
+    argon2 release the GIL), with at most max_queue jobs waiting. Extra work
+    is rejected with HashPoolBusy instead of piling up on request workers,
+    as is a caller that waits longer than timeout seconds. There is one
+    pool per process (see hash_pool()), so the limits apply per worker.
+    """
+
+    def __init__(self, max_workers, max_queue, timeout=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pwhash")
+        self.slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.stats = {
+            "workers": max_workers,
+            "max_queue": max_queue,
+            "in_flight": 0,
+            "completed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "hash_seconds_total": 0.0,
+            "hash_seconds_max": 0.0,
+        }
+
+    def _timed(self, fn, args, kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.stats["completed"] += 1
+                self.stats["hash_seconds_total"] += elapsed
+                self.stats["hash_seconds_max"] = max(self.stats["hash_seconds_max"], elapsed)
+
+    def run(self, fn, *args, **kwargs):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.stats["rejected"] += 1
+            raise HashPoolBusy("Too many concurrent password checks, retry shortly.")
+
+        with self.lock:
+            self.stats["in_flight"] += 1
+        try:
+            future = self.executor.submit(self._timed, fn, args, kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        # the slot is held until the hash itself finishes, even if the caller
+        # stops waiting, so the pool bound holds while it is overloaded
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            with self.lock:
+                self.stats["timed_out"] += 1
+            raise HashPoolBusy("Password check timed out, retry shortly.")
+
+    def _release(self, future):
+        with self.lock:
+            self.stats["in_flight"] -= 1
+        self.slots.release()
+
+    def metrics(self):
+        with self.lock:
+            data = dict(self.stats)
+        data["queue_depth"] = max(0, data["in_flight"] - data["workers"])
+        done = data["completed"]
+        data["hash_seconds_avg"] = data["hash_seconds_total"] / done if done else 0.0
+        return data
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hash_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashPool(
+                max_workers=getattr(settings, "PASSWORD_HASH_WORKERS", 2),
+                max_queue=getattr(settings, "PASSWORD_HASH_QUEUE", 4),
+                timeout=getattr(settings, "PASSWORD_HASH_TIMEOUT", 2),
+            )
+        return _pool
+
+
+# -------------------------
+# Helpers used by the auth backend and serializers
+# -------------------------
+def hash_password(raw):
+    return hash_pool().run(make_password, raw)
+
+
+def verify_password(raw, encoded):
+    return hash_pool().run(check_password, raw, encoded)
+
+
+def needs_rehash(encoded):
+    """True when encoded was made with a non-preferred hasher or old parameters."""
+    preferred = get_hasher("default")
+    try:
+        current = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return current.algorithm != preferred.algorithm or preferred.must_update(encoded)
@@ -0,0 +1,252 @@
+import csv
+import io
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from .models import AppUser, PatientProfile, DoctorProfile, normalize_specialization
+from .signals import invalidate_doctor_list
+
+USER_FIELDS = ("email", "first_name", "last_name")
+PATIENT_FIELDS = ("age", "gender", "contact", "address")
+DOCTOR_FIELDS = ("specialization", "phone", "clinic_address", "experience")
+INT_FIELDS = ("age", "experience")
+
+
+# -------------------------
+# Reading
+# -------------------------
+def read_rows(stream, fmt):
+    """Yield dict rows from a text stream of CSV or NDJSON."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt in ("ndjson", "jsonl"):
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # counted as an invalid row by the importer, like any other bad row
+                yield None
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def detect_format(name):
+    return "csv" if name.lower().endswith(".csv") else "ndjson"
+
+
+def _clean(row):
+    if not isinstance(row, dict):
+        raise TypeError("row is not an object")
+    if any(isinstance(v, (dict, list)) for v in row.values()):
+        raise TypeError("nested values are not supported")
+    # NDJSON can carry numbers / booleans where CSV would have text
+    row = {str(k).strip(): (None if v is None else str(v).strip()) for k, v in row.items() if k}
+    for f in INT_FIELDS:
+        v = row.get(f)
+        row[f] = int(v) if v not in (None, "") else None
+    row["role"] = (row.get("role") or "patient").lower()
+    return row
+
+
+def _validate(row):
+    """
+    Run the model fields' own checks (max_length, email format, integer
+    ranges) so one bad row is counted as an error instead of failing the
+    whole batch's bulk_create.
+    """
+    if row["role"] == "patient":
+        profile, profile_fields = PatientProfile, PATIENT_FIELDS
+    else:
+        profile, profile_fields = DoctorProfile, DOCTOR_FIELDS
+    for model, names in ((AppUser, ("username",) + USER_FIELDS), (profile, profile_fields)):
+        for name in names:
+            value = row.get(name)
+            if value in (None, ""):
+                continue
+            field = model._meta.get_field(name)
+            field.run_validators(field.to_python(value))
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+# -------------------------
+# Importing
+# -------------------------
+class UserImporter:
+    """
+    Creates users + patient/doctor profiles in batches: one transaction and
+    three bulk_create calls per batch. Passwords are hashed on a process pool
+    (workers > 1), or skipped entirely in invite mode, where users get an
+    unusable password plus a reset-style invite token (see invite_accept).
+    """
+
+    def __init__(self, batch_size=1000, workers=1, invite=False, progress=None):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.invite = invite
+        self.progress = progress
+        self.invites = []
+        self.stats = {"created": 0, "skipped": 0, "errors": 0}
+
+    def _hash_all(self, passwords, executor):
+        if self.invite:
+            unusable = make_password(None)
+            return [unusable] * len(passwords)
+        if executor is None:
+            return [make_password(p) for p in passwords]
+        chunk = max(1, len(passwords) // (self.workers * 4))
+        return list(executor.map(make_password, passwords, chunksize=chunk))
+
+    def _import_batch(self, batch, executor):
+        rows = []
+        for raw in batch:
+            try:
+                row = _clean(raw)
+            except (TypeError, ValueError):
+                self.stats["errors"] += 1
+                continue
+            if not row.get("username") or row["role"] not in ("patient", "doctor"):
+                self.stats["errors"] += 1
+                continue
+            try:
+                _validate(row)
+            except ValidationError:
+                self.stats["errors"] += 1
+                continue
+            if not self.invite and not row.get("password"):
+                self.stats["errors"] += 1
+                continue
+            rows.append(row)
+
+        names = [r["username"] for r in rows]
+        existing = set(AppUser.objects.filter(username__in=names).values_list("username", flat=True))
+        seen = set()
+        fresh = []
+        for r in rows:
+            if r["username"] in existing or r["username"] in seen:
+                self.stats["skipped"] += 1
+                continue
+            seen.add(r["username"])
+            fresh.append(r)
+        if not fresh:
+            return
+
+        hashes = self._hash_all([r.get("password") for r in fresh], executor)
+
+        with transaction.atomic():
+            users = AppUser.objects.bulk_create([
+                AppUser(
+                    username=r["username"],
+                    password=h,
+                    email=AppUser.objects.normalize_email(r.get("email")) or None,
+                    first_name=r.get("first_name") or "",
+                    last_name=r.get("last_name") or "",
+                )
+                for r, h in zip(fresh, hashes)
+            ])
+            if any(u.pk is None for u in users):
+                # backends without RETURNING: look the new ids up
+                ids = dict(AppUser.objects.filter(username__in=seen).values_list("username", "id"))
+                for u in users:
+                    u.pk = ids[u.username]
+
+            patients = []
+            doctors = []
+            for r, u in zip(fresh, users):
+                if r["role"] == "patient":
+                    patients.append(PatientProfile(
+                        user=u,
+                        age=r.get("age"),
+                        gender=r.get("gender") or "",
+                        contact=r.get("contact") or "",
+                        address=r.get("address") or "",
+                    ))
+                else:
+                    doctors.append(DoctorProfile(
+                        user=u,
+                        specialization=r.get("specialization") or "",
+                        specialization_key=normalize_specialization(r.get("specialization")),
+                        phone=r.get("phone") or "",
+                        clinic_address=r.get("clinic_address") or "",
+                        experience=r.get("experience"),
+                    ))
+            PatientProfile.objects.bulk_create(patients)
+            DoctorProfile.objects.bulk_create(doctors)
+
+        if self.invite:
+            for u in users:
+                self.invites.append({
+                    "username": u.username,
+                    "uid": urlsafe_base64_encode(force_bytes(u.pk)),
+                    "token": default_token_generator.make_token(u),
+                })
+
+        self.stats["created"] += len(users)
+
+    def run(self, rows):
+        start = time.perf_counter()
+        executor = None
+        if self.workers > 1 and not self.invite:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        try:
+            for batch in _batches(rows, self.batch_size):
+                self._import_batch(batch, executor)
+                if self.progress:
+                    self.progress(self.summary(time.perf_counter() - start))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            invalidate_doctor_list()
+
+        return self.summary(time.perf_counter() - start)
+
+    def summary(self, elapsed):
+        return {
+            **self.stats,
+            "seconds": round(elapsed, 3),
+            "users_per_second": round(self.stats["created"] / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def import_file(fileobj, name, max_rows=None, **options):
+    """
+    Import from an uploaded (binary) file; returns (summary, invites).
+    With max_rows, a file with more rows is rejected (ValueError) before
+    anything is written.
+    """
+    stream = io.TextIOWrapper(fileobj, encoding="utf-8-sig")
+    rows = read_rows(stream, detect_format(name))
+    if max_rows is not None:
+        rows = list(itertools.islice(rows, max_rows + 1))
+        if len(rows) > max_rows:
+            raise ValueError(f"At most {max_rows} rows per upload; use `manage.py import_users` for larger files.")
+    importer = UserImporter(**options)
+    summary = importer.run(rows)
+    return summary, importer.invites
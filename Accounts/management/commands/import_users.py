@@ -0,0 +1,56 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from Accounts.importer import UserImporter, detect_format, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import patients and doctors from CSV or NDJSON. Columns: username, "
+        "password, role (patient|doctor), email, first_name, last_name, plus the "
+        "profile fields (age, gender, contact, address / specialization, phone, "
+        "clinic_address, experience)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers", type=int, default=getattr(settings, "BULK_IMPORT_WORKERS", 1),
+            help="Processes used for password hashing (default: BULK_IMPORT_WORKERS).",
+        )
+        parser.add_argument("--invite", action="store_true", help="Skip hashing; issue invite tokens instead.")
+        parser.add_argument("--invites-out", help="CSV file for username,uid,token (invite mode).")
+
+    def handle(self, *args, **opts):
+        if opts["invite"] and not opts["invites_out"]:
+            raise CommandError("--invite needs --invites-out to store the invite tokens.")
+
+        def progress(s):
+            self.stdout.write(
+                f"created={s['created']} skipped={s['skipped']} errors={s['errors']} "
+                f"{s['users_per_second']} users/s"
+            )
+
+        importer = UserImporter(
+            batch_size=opts["batch_size"],
+            workers=opts["workers"],
+            invite=opts["invite"],
+            progress=progress,
+        )
+
+        fmt = opts["format"] or detect_format(opts["path"])
+        with open(opts["path"], encoding="utf-8-sig", newline="") as f:
+            summary = importer.run(read_rows(f, fmt))
+
+        if opts["invites_out"]:
+            with open(opts["invites_out"], "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["username", "uid", "token"])
+                writer.writeheader()
+                writer.writerows(importer.invites)
+
+        self.stdout.write(self.style.SUCCESS(json.dumps(summary)))
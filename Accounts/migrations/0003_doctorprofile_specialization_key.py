@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:59
+
+from django.db import migrations, models
+
+
+def fill_specialization_key(apps, schema_editor):
+    DoctorProfile = apps.get_model("Accounts", "DoctorProfile")
+    profiles = list(DoctorProfile.objects.only("id", "specialization"))
+    for p in profiles:
+        p.specialization_key = " ".join((p.specialization or "").split()).lower()
+    DoctorProfile.objects.bulk_update(profiles, ["specialization_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Accounts', '0002_doctorprofile_experience'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctorprofile',
+            name='specialization_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_specialization_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:20
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class AddIndexOnPostgres(migrations.AddIndex):
+    """AddIndex that does nothing on other databases (SQLite dev / test runs)."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # CREATE EXTENSION pg_trgm needs the CREATE privilege on the database
+    # (pg_trgm is a trusted extension on PostgreSQL 13+; superuser before that).
+    # Without it, have a DBA run "CREATE EXTENSION pg_trgm" once, then migrate.
+
+    dependencies = [
+        ('Accounts', '0003_doctorprofile_specialization_key'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexOnPostgres(
+            model_name='doctorprofile',
+            index=GinIndex(fields=['specialization_key'], name='accounts_doctor_spec_key_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
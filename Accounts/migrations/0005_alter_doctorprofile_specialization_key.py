@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Accounts', '0004_doctorprofile_specialization_trgm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='doctorprofile',
+            name='specialization_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin
@@ -9,8 +10,13 @@ class AppUserManager(BaseUserManager):
         if not username:
             raise ValueError("The Username must be set")
         email = self.normalize_email(email)
+        # encoded_password: an already-hashed password (e.g. from the hash pool)
+        encoded_password = extra_fields.pop("encoded_password", None)
         user = self.model(username=username, email=email, **extra_fields)
-        user.set_password(password)
+        if encoded_password is not None:
+            user.password = encoded_password
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
@@ -53,13 +59,33 @@ class PatientProfile(models.Model):
     def __str__(self):
         return f"Patient({self.user.username})"
 
+def normalize_specialization(value):
+    """Lower-cased, whitespace-collapsed form used for indexed lookups."""
+    return " ".join((value or "").split()).lower()
+
 class DoctorProfile(models.Model):
     user = models.OneToOneField(AppUser, on_delete=models.CASCADE, related_name="doctor_profile")
     specialization = models.CharField(max_length=200, blank=True)
+    # normalized copy of specialization, kept in sync by save()
+    # searched with LIKE '%term%', which a b-tree can't serve; see the trigram index below
+    specialization_key = models.CharField(max_length=200, blank=True, editable=False)
     phone = models.CharField(max_length=20, blank=True)
     clinic_address = models.TextField(blank=True)
     # NEW: years of experience
     experience = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Years of experience")
 
+    def save(self, *args, **kwargs):
+        self.specialization_key = normalize_specialization(self.specialization)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "specialization" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "specialization_key"}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # PostgreSQL only; created by migration 0004 and skipped on other databases
+            GinIndex(fields=["specialization_key"], name="accounts_doctor_spec_key_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
     def __str__(self):
         return f"Doctor({self.user.username})"
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import AppUser, PatientProfile, DoctorProfile
 from django.contrib.auth import authenticate
+from .hashers import hash_password
 
 class AppUserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -54,7 +55,9 @@ class RegisterSerializer(serializers.Serializer):
         clinic_address = validated_data.pop("clinic_address", "")
         experience = validated_data.pop("experience", None)
 
-        user = AppUser.objects.create_user(username=username, password=password, email=email)
+        user = AppUser.objects.create_user(
+            username=username, email=email, encoded_password=hash_password(password)
+        )
         if role == "patient":
             PatientProfile.objects.create(
                 user=user,
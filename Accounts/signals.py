@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_token, forget_user_tokens
+from .models import AppUser, DoctorProfile
+
+DOCTOR_LIST_VERSION_KEY = "accounts:doctor-list:version"
+
+
+def doctor_list_version():
+    return cache.get_or_set(DOCTOR_LIST_VERSION_KEY, 1, None)
+
+
+def invalidate_doctor_list():
+    """Drop every cached doctor-list page by bumping the key version."""
+    try:
+        cache.incr(DOCTOR_LIST_VERSION_KEY)
+    except ValueError:
+        cache.set(DOCTOR_LIST_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=DoctorProfile)
+@receiver(post_delete, sender=DoctorProfile)
+def doctor_profile_changed(sender, **kwargs):
+    invalidate_doctor_list()
+
+
+@receiver(post_save, sender=AppUser)
+def doctor_user_changed(sender, instance, update_fields=None, **kwargs):
+    # doctor entries embed the user's name / email; deletes cascade to the profile
+    if update_fields is not None and set(update_fields) <= {"last_login", "password"}:
+        return
+    if DoctorProfile.objects.filter(user_id=instance.pk).exists():
+        invalidate_doctor_list()
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=AppUser)
+def user_tokens_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    # set_password() leaves the raw password on _password until save() finishes:
+    # revoke the user's tokens; any other change just refreshes the cached user.
+    if getattr(instance, "_password", None) is not None:
+        Token.objects.filter(user_id=instance.pk).delete()
+    else:
+        forget_user_tokens(instance.pk)
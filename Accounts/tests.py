@@ -1,3 +1,352 @@
-from django.test import TestCase
+import io
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from .authentication import CachedTokenAuthentication
+from .checks import token_cache_check
+from .hashers import HashPool, HashPoolBusy
+from .importer import UserImporter, import_file, read_rows
+from .models import AppUser, DoctorProfile, PatientProfile
+
+
+# -------------------------
+# Bulk import
+# -------------------------
+ROWS = b"""\
+{"username": "pat1", "password": "pw12345!", "role": "patient", "age": "30", "gender": "F"}
+{"username": "doc1", "password": "pw12345!", "role": "Doctor", "specialization": " Heart Surgeon ", "experience": 7}
+{"username": "nopass"}
+{"username": "nurse1", "password": "pw", "role": "nurse"}
+{"username": "badage", "password": "pw", "age": "x"}
+"""
+
+BAD_ROWS = b"""\
+{"username": "ok1", "password": "pw12345!"}
+[1, 2]
+{not json
+"just a string"
+{"username": "bademail", "password": "pw", "email": "nope"}
+{"username": "longgender", "password": "pw", "gender": "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"}
+{"username": "negage", "password": "pw", "age": -3}
+{"username": "nested", "password": "pw", "age": [1]}
+{"username": 5, "password": 123}
+"""
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class UserImporterTests(TestCase):
+    def _run(self, data=ROWS, name="users.ndjson", **options):
+        summary, _ = import_file(io.BytesIO(data), name, **options)
+        return summary
+
+    def test_creates_users_and_profiles(self):
+        summary = self._run()
+        self.assertEqual((summary["created"], summary["skipped"], summary["errors"]), (2, 0, 3))
+        patient = PatientProfile.objects.get(user__username="pat1")
+        self.assertEqual((patient.age, patient.gender), (30, "F"))
+        doctor = DoctorProfile.objects.get(user__username="doc1")
+        self.assertEqual((doctor.specialization, doctor.experience), ("Heart Surgeon", 7))
+        self.assertTrue(AppUser.objects.get(username="doc1").check_password("pw12345!"))
+
+    def test_existing_and_repeated_usernames_are_skipped(self):
+        self._run()
+        summary = self._run(b'{"username": "pat1", "password": "x"}\n{"username": "new", "password": "x"}\n'
+                            b'{"username": "new", "password": "y"}\n')
+        self.assertEqual((summary["created"], summary["skipped"], summary["errors"]), (1, 2, 0))
+
+    def test_invite_mode_needs_no_password(self):
+        summary, invites = import_file(io.BytesIO(ROWS), "users.ndjson", invite=True)
+        self.assertEqual(summary["created"], 3)  # nopass is accepted
+        self.assertEqual(len(invites), 3)
+        self.assertFalse(AppUser.objects.get(username="nopass").has_usable_password())
+
+    def test_csv(self):
+        data = b"username,password,role,specialization\ncsv1,pw,doctor,Dermatologist\ncsv2,,patient,\n"
+        summary = self._run(data, "users.csv")
+        self.assertEqual((summary["created"], summary["errors"]), (1, 1))
+
+    def test_malformed_lines_and_invalid_fields_are_counted_not_raised(self):
+        summary = self._run(BAD_ROWS)
+        self.assertEqual((summary["created"], summary["errors"]), (2, 7))
+        self.assertEqual(set(AppUser.objects.values_list("username", flat=True)), {"ok1", "5"})
+        # numbers in NDJSON are read as text
+        self.assertTrue(AppUser.objects.get(username="5").check_password("123"))
+
+    def test_bad_row_does_not_roll_back_its_batch(self):
+        summary = self._run(ROWS + BAD_ROWS, batch_size=100)
+        self.assertEqual((summary["created"], summary["errors"]), (4, 10))
+
+    def test_max_rows(self):
+        with self.assertRaises(ValueError):
+            self._run(max_rows=4)
+        self.assertFalse(AppUser.objects.exists())
+        self.assertEqual(self._run(max_rows=5)["created"], 2)
+
+    def test_read_rows_yields_none_for_invalid_json(self):
+        rows = list(read_rows(io.StringIO('{"a": 1}\n\n{oops\n'), "ndjson"))
+        self.assertEqual(rows, [{"a": 1}, None])
+
+    def test_importer_takes_any_iterable(self):
+        summary = UserImporter(invite=True).run([{"username": "it1"}, None, "x"])
+        self.assertEqual((summary["created"], summary["errors"]), (1, 2))
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000, BULK_IMPORT_MAX_ROWS=10, BULK_IMPORT_MAX_INVITE_ROWS=50)
+class ImportUsersViewTests(TestCase):
+    url = "/api/accounts/import/"
+
+    def setUp(self):
+        self.client.force_login(AppUser.objects.create_superuser("admin", "pw"))
+
+    def _upload(self, rows, **data):
+        body = b"".join(b'{"username": "u%d", "password": "pw12345!"}\n' % i for i in range(rows))
+        return self.client.post(self.url, {"file": SimpleUploadedFile("users.ndjson", body), **data})
+
+    def test_password_rows_are_limited(self):
+        self.assertEqual(self._upload(10).json()["created"], 10)
+        response = self._upload(11)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("invite=1", response.json()["detail"])
+
+    def test_invite_mode_takes_larger_files(self):
+        response = self._upload(40, invite="1")
+        self.assertEqual(response.json()["created"], 40)
+        self.assertEqual(len(response.json()["invites"]), 40)
+
+    def test_admin_only(self):
+        self.client.force_login(AppUser.objects.create_user("plain", password=None))
+        self.assertEqual(self._upload(1).status_code, 403)
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class InviteAcceptTests(TestCase):
+    url = "/api/accounts/invite/accept/"
+
+    def setUp(self):
+        _, (self.invite,) = import_file(io.BytesIO(b'{"username": "inv1"}\n'), "users.ndjson", invite=True)
+
+    def _accept(self, password, **overrides):
+        return self.client.post(self.url, {**self.invite, "password": password, **overrides},
+                                content_type="application/json")
+
+    def test_sets_password_and_returns_token(self):
+        response = self._accept("correct horse 42")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["token"])
+        self.assertTrue(AppUser.objects.get(username="inv1").check_password("correct horse 42"))
+        # the invite token is tied to the old (unusable) password
+        self.assertEqual(self._accept("another horse 43").status_code, 400)
+
+    def test_weak_password_is_rejected(self):
+        response = self._accept("1234")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()["password"])
+        self.assertFalse(AppUser.objects.get(username="inv1").has_usable_password())
+
+    def test_bad_token(self):
+        self.assertEqual(self._accept("correct horse 42", token="nope").status_code, 400)
+
+    def test_busy_hash_pool_answers_503(self):
+        with mock.patch("Accounts.views.hash_password", side_effect=HashPoolBusy("busy")):
+            response = self._accept("correct horse 42")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(AppUser.objects.get(username="inv1").has_usable_password())
+
+
+# -------------------------
+# Doctor list
+# -------------------------
+@override_settings(DOCTOR_LIST_CACHE_TTL=30)
+class DoctorListTests(TestCase):
+    url = "/api/accounts/doctors/"
+
+    def setUp(self):
+        cache.clear()
+        for i, spec in enumerate(["Cardiologist", "Pediatric  CARDIOLOGIST", "Dermatologist", ""]):
+            user = AppUser.objects.create_user(f"doc{i}", password=None)
+            DoctorProfile.objects.create(user=user, specialization=spec)
+
+    def _names(self, data):
+        return [d["user"]["username"] for d in data["results"]]
+
+    def test_cursor_pages_cover_every_doctor_once(self):
+        names, url, pages = [], self.url + "?page_size=3", 0
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data["results"]), 3)
+            names += self._names(data)
+            url, pages = data["next"], pages + 1
+        self.assertEqual(pages, 2)
+        self.assertEqual(names, ["doc0", "doc1", "doc2", "doc3"])
+
+    def test_specialization_is_a_normalized_substring_match(self):
+        data = self.client.get(self.url, {"specialization": " pediatric cardio"}).json()
+        self.assertEqual(self._names(data), ["doc1"])
+        data = self.client.get(self.url, {"specialization": "CARDIO"}).json()
+        self.assertEqual(self._names(data), ["doc0", "doc1"])
+        data = self.client.get(self.url, {"specialization": "All"}).json()
+        self.assertEqual(len(data["results"]), 4)
+
+    def test_saving_a_doctor_drops_cached_pages(self):
+        params = {"specialization": "cardio"}
+        self.assertEqual(self._names(self.client.get(self.url, params).json()), ["doc0", "doc1"])
+
+        # a write that bypasses the signals is not seen while the page is cached
+        DoctorProfile.objects.filter(user__username="doc2").update(specialization_key="cardiology")
+        self.assertEqual(self._names(self.client.get(self.url, params).json()), ["doc0", "doc1"])
+
+        doctor = DoctorProfile.objects.get(user__username="doc3")
+        doctor.specialization = "Cardiothoracic Surgeon"
+        doctor.save()
+        self.assertEqual(self._names(self.client.get(self.url, params).json()), ["doc0", "doc1", "doc2", "doc3"])
+
+    def test_renaming_a_doctors_user_drops_cached_pages(self):
+        self.client.get(self.url)
+        user = AppUser.objects.get(username="doc0")
+        user.first_name = "Ada"
+        user.save()
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["results"][0]["user"]["first_name"], "Ada")
+
+
+# -------------------------
+# Token authentication
+# -------------------------
+@override_settings(TOKEN_AUTH_CACHE_TTL=300, PASSWORD_PBKDF2_ITERATIONS=1000)
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = AppUser.objects.create_user("tok", password=None)
+        self.token = Token.objects.create(user=self.user)
+
+    def _me(self):
+        return self.client.get("/api/accounts/me/", HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_auth_is_the_token_and_repeats_are_served_from_cache(self):
+        auth = CachedTokenAuthentication()
+        user, token = auth.authenticate_credentials(self.token.key)
+        self.assertIsInstance(token, Token)
+        self.assertEqual((user, token.key), (self.user, self.token.key))
+        with self.assertNumQueries(0):
+            user, token = auth.authenticate_credentials(self.token.key)
+        self.assertIsInstance(token, Token)
+        self.assertEqual((user, token.key), (self.user, self.token.key))
+
+    def test_logout_revokes_the_cached_token(self):
+        self.assertEqual(self._me().status_code, 200)
+        response = self.client.post("/api/accounts/logout/", HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Token.objects.exists())
+        self.assertEqual(self._me().status_code, 401)
+
+    def test_password_change_revokes_the_cached_token(self):
+        self.assertEqual(self._me().status_code, 200)
+        self.user.set_password("new pw 12345!")
+        self.user.save()
+        self.assertFalse(Token.objects.exists())
+        self.assertEqual(self._me().status_code, 401)
+
+    def test_other_user_changes_refresh_the_cached_user(self):
+        self.assertEqual(self._me().json()["first_name"], "")
+        self.user.first_name = "Ada"
+        self.user.save()
+        self.assertEqual(self._me().json()["first_name"], "Ada")
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self._me().status_code, 200)
+        AppUser.objects.filter(pk=self.user.pk).update(is_active=False)  # no signal: cached user is stale
+        self.assertEqual(self._me().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self._me().status_code, 401)
+
+
+class TokenCacheCheckTests(SimpleTestCase):
+    LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://x"}}
+
+    def test_per_process_cache_warns_outside_debug(self):
+        with self.settings(CACHES=self.LOCMEM, TOKEN_AUTH_CACHE_TTL=0, DEBUG=False):
+            self.assertEqual([w.id for w in token_cache_check(None)], ["Accounts.W001"])
+        with self.settings(CACHES=self.LOCMEM, TOKEN_AUTH_CACHE_TTL=0, DEBUG=True):
+            self.assertEqual(token_cache_check(None), [])
+        with self.settings(CACHES=self.LOCMEM, TOKEN_AUTH_CACHE_TTL=60, DEBUG=True):
+            self.assertEqual([w.id for w in token_cache_check(None)], ["Accounts.W001"])
+
+    def test_shared_cache_is_fine(self):
+        with self.settings(CACHES=self.REDIS, TOKEN_AUTH_CACHE_TTL=300, DEBUG=False):
+            self.assertEqual(token_cache_check(None), [])
+
+
+# -------------------------
+# Hash pool
+# -------------------------
+class HashPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _block(self):
+        self.release.wait(5)
+        return "done"
+
+    def _wait_idle(self, pool):
+        deadline = time.monotonic() + 5
+        while pool.metrics()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_runs_and_records_metrics(self):
+        pool = HashPool(max_workers=1, max_queue=0)
+        self.assertEqual(pool.run(lambda a, b=0: a + b, 1, b=2), 3)
+        self._wait_idle(pool)
+        metrics = pool.metrics()
+        self.assertEqual((metrics["completed"], metrics["in_flight"], metrics["queue_depth"]), (1, 0, 0))
+
+    def test_rejects_when_full(self):
+        pool = HashPool(max_workers=1, max_queue=0)
+        waiter = threading.Thread(target=pool.run, args=(self._block,))
+        waiter.start()
+        deadline = time.monotonic() + 5
+        while not pool.metrics()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        with self.assertRaises(HashPoolBusy):
+            pool.run(len, "x")
+        self.assertEqual(pool.metrics()["rejected"], 1)
+
+        self.release.set()
+        waiter.join(5)
+        self._wait_idle(pool)
+        self.assertEqual(pool.run(len, "x"), 1)
+
+    def test_timeout_raises_busy_and_keeps_slot_until_hash_finishes(self):
+        pool = HashPool(max_workers=1, max_queue=0, timeout=0.05)
+        with self.assertRaises(HashPoolBusy):
+            pool.run(self._block)
+        metrics = pool.metrics()
+        self.assertEqual((metrics["timed_out"], metrics["in_flight"]), (1, 1))
+
+        # the abandoned hash still occupies the only slot
+        with self.assertRaises(HashPoolBusy):
+            pool.run(len, "x")
+
+        self.release.set()
+        self._wait_idle(pool)
+        self.assertEqual(pool.metrics()["in_flight"], 0)
+        self.assertEqual(pool.run(len, "x"), 1)
+
+    def test_failed_job_releases_slot(self):
+        pool = HashPool(max_workers=1, max_queue=0)
+        with self.assertRaises(ZeroDivisionError):
+            pool.run(lambda: 1 / 0)
+        self._wait_idle(pool)
+        self.assertEqual(pool.run(len, "ab"), 2)
@@ -1,13 +1,26 @@
 # Accounts/urls.py
 from django.urls import path
-from .views import RegisterView, login_view, me, DoctorListView
+from .authentication import jwt_enabled
+from .views import (
+    RegisterView, login_view, logout_view, me, auth_metrics,
+    import_users, invite_accept, DoctorListView,
+)
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", login_view, name="login"),
+    path("logout/", logout_view, name="logout"),
     path("me/", me, name="me"),
+    path("auth-metrics/", auth_metrics, name="auth-metrics"),
+    path("import/", import_users, name="import-users"),
+    path("invite/accept/", invite_accept, name="invite-accept"),
 
     # Doctors list endpoint (GET)
     # Example: /api/accounts/doctors/?specialization=Radiologist
     path("doctors/", DoctorListView.as_view(), name="doctor-list"),
 ]
+
+if jwt_enabled():
+    from rest_framework_simplejwt.views import TokenRefreshView
+
+    urlpatterns.append(path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"))
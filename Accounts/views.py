@@ -1,20 +1,47 @@
 # Accounts/views.py
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import RegisterSerializer, LoginSerializer, AppUserSerializer, DoctorProfileSerializer
 from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.parsers import MultiPartParser
 from rest_framework.decorators import (
     api_view,
+    parser_classes,
     permission_classes,
     authentication_classes,
 )
-from rest_framework.authentication import TokenAuthentication
 
 # DRF generics for the doctors list view
 from rest_framework.generics import ListAPIView
-from .models import DoctorProfile
+from rest_framework.pagination import CursorPagination
+
+from .serializers import RegisterSerializer, LoginSerializer, AppUserSerializer, DoctorProfileSerializer
+from .models import AppUser, DoctorProfile, normalize_specialization
+from .authentication import (
+    CachedTokenAuthentication,
+    JWT_USER_CLAIMS,
+    issue_token,
+    me_authentication_classes,
+)
+from .hashers import HashPoolBusy, hash_pool, hash_password
+from .importer import import_file
+from .signals import doctor_list_version
+
+def _busy(exc):
+    # password hashing pool is saturated: shed load instead of queueing
+    return Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "1"})
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
@@ -22,50 +49,167 @@ class RegisterView(APIView):
     def post(self, request):
         ser = RegisterSerializer(data=request.data)
         if ser.is_valid():
-            user = ser.save()
-            token, _ = Token.objects.get_or_create(user=user)
-            return Response({"token": token.key, "username": user.username}, status=status.HTTP_201_CREATED)
+            try:
+                user = ser.save()
+            except HashPoolBusy as e:
+                return _busy(e)
+            return Response({**issue_token(user), "username": user.username}, status=status.HTTP_201_CREATED)
         return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def login_view(request):
     ser = LoginSerializer(data=request.data)
-    if ser.is_valid():
+    try:
+        valid = ser.is_valid()
+    except HashPoolBusy as e:
+        return _busy(e)
+    if valid:
         user = ser.validated_data["user"]
-        token, _ = Token.objects.get_or_create(user=user)
-        return Response({"token": token.key, "username": user.username})
+        return Response({**issue_token(user), "username": user.username})
     return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(["POST"])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def logout_view(request):
+    """
+    Deletes the caller's token (and its cached lookup).
+    Stateless JWTs cannot be revoked; they expire after ACCESS_TOKEN_LIFETIME.
+    """
+    Token.objects.filter(key=request.auth.key).delete()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+@api_view(["POST"])
+@authentication_classes([CachedTokenAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser])
+def import_users(request):
+    """
+    Admin bulk import. multipart: file (.csv / .ndjson), optional
+    batch_size, invite ("1" to skip hashing and return invite tokens).
+    Same importer as `manage.py import_users`, but run inside the request:
+    hashing stays on this worker's thread (no process pool), so uploads with
+    passwords are limited to BULK_IMPORT_MAX_ROWS (10) rows. Invite mode does
+    no hashing and takes up to BULK_IMPORT_MAX_INVITE_ROWS; anything larger
+    goes through the management command.
+    """
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"detail": "Upload a CSV or NDJSON file as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+
+    invite = request.data.get("invite") in ("1", "true", "True")
+    if invite:
+        max_rows = getattr(settings, "BULK_IMPORT_MAX_INVITE_ROWS", 5000)
+    else:
+        max_rows = getattr(settings, "BULK_IMPORT_MAX_ROWS", 10)
+
+    try:
+        summary, invites = import_file(
+            upload.file, upload.name,
+            max_rows=max_rows,
+            batch_size=max(1, min(int(request.data.get("batch_size", 500)), 1000)),
+            workers=1,
+            invite=invite,
+        )
+    except ValueError as e:
+        detail = str(e) if invite else f"{e} Or upload with invite=1 and let users set their own passwords."
+        return Response({"detail": detail}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({**summary, "invites": invites})
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def invite_accept(request):
+    """Sets the password of an invited (bulk-imported) user: {uid, token, password}."""
+    try:
+        pk = force_str(urlsafe_base64_decode(request.data.get("uid", "")))
+        user = AppUser.objects.get(pk=pk)
+    except (TypeError, ValueError, OverflowError, AppUser.DoesNotExist):
+        user = None
+
+    password = request.data.get("password")
+    if user is None or not password or not default_token_generator.check_token(user, request.data.get("token", "")):
+        return Response({"detail": "Invalid or expired invite."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        validate_password(password, user)
+    except ValidationError as e:
+        return Response({"password": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        user.password = hash_password(password)
+    except HashPoolBusy as e:
+        return _busy(e)
+    user.save(update_fields=["password"])
+    return Response({**issue_token(user), "username": user.username})
+
+@api_view(["GET"])
+@authentication_classes([CachedTokenAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def auth_metrics(request):
+    """Password hashing pool stats: hash timings, in-flight work, queue depth, rejections."""
+    return Response(hash_pool().metrics())
+
 @api_view(["GET"])
-@authentication_classes([TokenAuthentication])
+@authentication_classes(me_authentication_classes())
 @permission_classes([IsAuthenticated])
 def me(request):
     """
     Returns the serialized current user.
     Requires Token authentication: send header `Authorization: Token <token>`
+    (or `Authorization: Bearer <jwt>` when AUTH_TOKEN_MODE = "jwt")
     """
     user = request.user
+    if not isinstance(user, AppUser):
+        # stateless JWT user: answer from the signed claims, no DB hit
+        data = {claim: request.auth.get(claim, "") for claim in JWT_USER_CLAIMS}
+        return Response({"id": int(user.id), **data})
     return Response(AppUserSerializer(user).data)
 
 # -------------------------
 # New: Read-only list endpoint for doctors (safe)
-# URL: /api/accounts/doctors/?specialization=Radiologist
+# URL: /api/accounts/doctors/?specialization=Radiologist&cursor=...
 # If specialization param is empty or "All" -> returns all doctors
 # Uses your existing DoctorProfile model and DoctorProfileSerializer
 # -------------------------
+class DoctorCursorPagination(CursorPagination):
+    page_size = getattr(settings, "DOCTOR_LIST_PAGE_SIZE", 20)
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    ordering = "id"
+
+
 class DoctorListView(ListAPIView):
     """
-    Returns a list of doctors. Optional query param:
-      - specialization (string): filters doctors by specialization (icontains)
+    Returns a cursor-paginated list of doctors. Optional query param:
+      - specialization (string): case-insensitive substring match on the
+        normalized specialization_key ("cardio" finds "Pediatric
+        Cardiologist"); served by a pg_trgm GIN index on PostgreSQL
+    Serialized pages are cached for DOCTOR_LIST_CACHE_TTL seconds and
+    dropped whenever a doctor profile (or a doctor's user) is saved.
     """
     serializer_class = DoctorProfileSerializer
-    queryset = DoctorProfile.objects.all()
+    queryset = DoctorProfile.objects.select_related("user")
+    pagination_class = DoctorCursorPagination
 
     def get_queryset(self):
         qs = super().get_queryset()
-        specialization = self.request.query_params.get("specialization", "").strip()
-        if specialization and specialization.lower() != "all":
-            # filter by specialization field (case-insensitive contains)
-            qs = qs.filter(specialization__icontains=specialization)
+        specialization = normalize_specialization(self.request.query_params.get("specialization", ""))
+        if specialization and specialization != "all":
+            # key is already lower-cased, so a plain LIKE '%term%' can use the trigram index
+            qs = qs.filter(specialization_key__contains=specialization)
         return qs
+
+    def list(self, request, *args, **kwargs):
+        ttl = getattr(settings, "DOCTOR_LIST_CACHE_TTL", 30)
+        if not ttl:
+            return super().list(request, *args, **kwargs)
+
+        key = "accounts:doctor-list:{}:{}".format(
+            doctor_list_version(),
+            hashlib.md5(request.build_absolute_uri().encode()).hexdigest(),
+        )
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, ttl)
+        return Response(data)
@@ -0,0 +1,57 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("Backend.metrics")
+
+
+class QueryMetricsMiddleware:
+    """
+    Counts the SQL queries and DB time spent by each request and logs
+    them with the total latency at INFO on "Backend.metrics". Listed first
+    in MIDDLEWARE so the session / auth middleware's queries are included.
+    With DB_QUERY_METRICS_HEADERS (default: DEBUG) they are also sent as
+    X-DB-Queries / X-DB-Time-ms / X-Response-Time-ms headers. Disabled with
+    DB_QUERY_METRICS = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "DB_QUERY_METRICS", True)
+        self.headers = getattr(settings, "DB_QUERY_METRICS_HEADERS", settings.DEBUG)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats = {"queries": 0, "db_time": 0.0}
+
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats["queries"] += 1
+                stats["db_time"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(wrapper))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        if self.headers:
+            response["X-DB-Queries"] = str(stats["queries"])
+            response["X-DB-Time-ms"] = f"{stats['db_time'] * 1000:.2f}"
+            response["X-Response-Time-ms"] = f"{elapsed * 1000:.2f}"
+
+        logger.info(
+            "%s %s %s queries=%d db_ms=%.2f total_ms=%.2f",
+            request.method, request.path, response.status_code,
+            stats["queries"], stats["db_time"] * 1000, elapsed * 1000,
+        )
+        return response
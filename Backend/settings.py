@@ -1,6 +1,8 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Load environment variables
 load_dotenv()
@@ -48,7 +50,9 @@ AUTH_USER_MODEL = "Accounts.AppUser"
 # MIDDLEWARE
 # ----------------------------
 MIDDLEWARE = [
-    "corsheaders.middleware.CorsMiddleware",  # must be at top
+    # outermost, so queries made by the session / auth middleware are counted too
+    "Backend.middleware.QueryMetricsMiddleware",
+    "corsheaders.middleware.CorsMiddleware",  # must be above anything that can respond
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -90,11 +94,94 @@ DATABASES = {
         "NAME": os.getenv("DATABASE_NAME"),
         "USER": os.getenv("USER"),
         "PASSWORD": os.getenv("PASS"),
-        "HOST": "localhost",
-        "PORT": "5432",
+        "HOST": os.getenv("DATABASE_HOST", "localhost"),
+        "PORT": os.getenv("DATABASE_PORT", "5432"),
+        # keep connections open between requests (seconds, 0 = close each request)
+        "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": os.getenv("DATABASE_CONN_HEALTH_CHECKS", "1") == "1",
+        "OPTIONS": {},
     }
 }
 
+# Native connection pool (Django 5.1+, needs psycopg 3: pip install "psycopg[pool]").
+# Pooling replaces persistent connections, so CONN_MAX_AGE is forced to 0.
+if os.getenv("DATABASE_POOL", "0") == "1":
+    if not (find_spec("psycopg") and find_spec("psycopg_pool")):
+        raise ImproperlyConfigured(
+            'DATABASE_POOL=1 needs psycopg 3 with its pool (pip install "psycopg[pool]"); '
+            "psycopg2 from requirements.txt has no connection pool."
+        )
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+    }
+
+# Per-request query count / DB time / latency, logged at INFO to "Backend.metrics"
+# (see LOGGING); the X-DB-* / X-Response-Time-ms response headers are only sent when DEBUG is on
+DB_QUERY_METRICS = os.getenv("DB_QUERY_METRICS", "1") == "1"
+DB_QUERY_METRICS_HEADERS = os.getenv("DB_QUERY_METRICS_HEADERS", "1" if DEBUG else "0") == "1"
+
+# ----------------------------
+# LOGGING
+# ----------------------------
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "Backend.metrics": {
+            "handlers": ["console"],
+            "level": os.getenv("DB_QUERY_METRICS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# ----------------------------
+# CACHE
+# ----------------------------
+# Per-process memory cache by default; point at a shared backend (e.g.
+# django.core.cache.backends.redis.RedisCache) so invalidation reaches every worker.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# ----------------------------
+# PASSWORD HASHING
+# ----------------------------
+# PASSWORD_HASHER picks the hasher for new / upgraded hashes ("pbkdf2", "scrypt",
+# "argon2" - argon2 needs `pip install argon2-cffi`). The others stay listed so
+# existing hashes still verify and are rehashed on the next successful login.
+_HASHERS = {
+    "pbkdf2": "Accounts.hashers.TunablePBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+}
+_preferred_hasher = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [_HASHERS[_preferred_hasher]] + [
+    h for name, h in _HASHERS.items() if name != _preferred_hasher
+] + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000"))
+
+# Password checks run on a bounded thread pool; beyond WORKERS + QUEUE
+# concurrent logins/registrations, or after waiting TIMEOUT seconds, the API
+# answers 503 + Retry-After. The limits are per process: each gunicorn / uvicorn
+# worker has its own pool, so a host admits workers x (WORKERS + QUEUE) hashes.
+# The queue stays short on purpose: a hash at the default work factor takes a few
+# hundred ms, so a longer queue only turns load into latency clients give up on.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", str(2 * PASSWORD_HASH_WORKERS)))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "2"))
+
+AUTHENTICATION_BACKENDS = ["Accounts.backends.PooledModelBackend"]
+
 # ----------------------------
 # PASSWORD VALIDATORS
 # ----------------------------
@@ -153,3 +240,63 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
 }
+
+# ----------------------------
+# DISEASE PREDICTOR
+# ----------------------------
+PREDICT_TOP_K = int(os.getenv("PREDICT_TOP_K", "5"))
+PREDICT_MAX_TOP_K = int(os.getenv("PREDICT_MAX_TOP_K", "50"))
+PREDICT_MAX_BATCH = int(os.getenv("PREDICT_MAX_BATCH", "256"))
+PREDICT_MIN_PROB = float(os.getenv("PREDICT_MIN_PROB", "0.0"))
+
+# Agreement a reduced export (/export/) needs with the full model before it may replace model.pkl
+EXPORT_MIN_AGREEMENT = float(os.getenv("EXPORT_MIN_AGREEMENT", "0.99"))
+EXPORT_MIN_TOPK_AGREEMENT = float(os.getenv("EXPORT_MIN_TOPK_AGREEMENT", "0.95"))
+
+# Opt-in audit log of /predict/ inputs and top-k outputs (PredictionLog)
+PREDICTION_LOG_ENABLED = os.getenv("PREDICTION_LOG_ENABLED", "0") == "1"
+PREDICTION_LOG_BATCH_SIZE = int(os.getenv("PREDICTION_LOG_BATCH_SIZE", "500"))
+PREDICTION_LOG_FLUSH_SECONDS = float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "2"))
+PREDICTION_LOG_MAX_QUEUE = int(os.getenv("PREDICTION_LOG_MAX_QUEUE", "10000"))
+PREDICTION_LOG_RETENTION_DAYS = int(os.getenv("PREDICTION_LOG_RETENTION_DAYS", "90"))
+TRAIN_COMPACT = os.getenv("TRAIN_COMPACT", "1") == "1"
+TRAIN_NOISE_COPIES = int(os.getenv("TRAIN_NOISE_COPIES", "4"))
+
+# Startup warm-up (model, Training.csv, symptom index, subsymptoms.json), see
+# DiseasePredictor/warmup.py: "off", "sync" (use with gunicorn --preload to
+# share the loaded model copy-on-write) or "background"
+PREDICTOR_WARMUP = os.getenv("PREDICTOR_WARMUP", "background")
+
+# ----------------------------
+# ACCOUNTS
+# ----------------------------
+DOCTOR_LIST_PAGE_SIZE = int(os.getenv("DOCTOR_LIST_PAGE_SIZE", "20"))
+DOCTOR_LIST_CACHE_TTL = int(os.getenv("DOCTOR_LIST_CACHE_TTL", "30"))
+
+# Processes used to hash passwords in `manage.py import_users`
+BULK_IMPORT_WORKERS = int(os.getenv("BULK_IMPORT_WORKERS", "1"))
+# Row limits for the synchronous admin upload endpoint (password rows / invite rows).
+# Password rows are hashed inside the request, a few hundred ms each, so keep that
+# limit small; larger files go through invite mode or the management command
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "10"))
+BULK_IMPORT_MAX_INVITE_ROWS = int(os.getenv("BULK_IMPORT_MAX_INVITE_ROWS", "5000"))
+
+# Token -> user cache lifetime for CachedTokenAuthentication (0 disables). Needs a
+# shared cache (CACHE_BACKEND = Redis / Memcached): with the per-process LocMem cache
+# logout / password changes only evict the entry in the worker that handled them, so
+# it is off by default there, capped at a few seconds if set anyway, and check
+# Accounts.W001 warns outside DEBUG
+_LOCAL_CACHE = CACHES["default"]["BACKEND"].endswith(("LocMemCache", "DummyCache"))
+TOKEN_AUTH_CACHE_TTL = int(os.getenv("TOKEN_AUTH_CACHE_TTL", "0" if _LOCAL_CACHE else "300"))
+
+# "token" = DRF tokens (default), "jwt" = stateless signed tokens via simplejwt
+AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "token")
+
+if AUTH_TOKEN_MODE == "jwt":
+    from datetime import timedelta
+
+    INSTALLED_APPS.append("rest_framework_simplejwt")
+    SIMPLE_JWT = {
+        "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", "15"))),
+        "REFRESH_TOKEN_LIFETIME": timedelta(days=int(os.getenv("JWT_REFRESH_DAYS", "7"))),
+    }
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+from unittest import skipIf
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from Accounts.models import AppUser
+
+
+class QueryMetricsMiddlewareTests(TestCase):
+    def test_is_outermost(self):
+        self.assertEqual(settings.MIDDLEWARE[0], "Backend.middleware.QueryMetricsMiddleware")
+
+    @override_settings(SESSION_SAVE_EVERY_REQUEST=True)
+    def test_counts_queries_made_by_other_middleware(self):
+        self.client.force_login(AppUser.objects.create_user("metrics", password=None))
+        with self.assertLogs("Backend.metrics", "INFO") as logs:
+            # no view runs a query here; the session middleware does on the way out
+            self.client.get("/no-such-page/")
+        queries = int(logs.records[-1].args[3])
+        self.assertGreater(queries, 0)
+
+    @override_settings(DB_QUERY_METRICS_HEADERS=True)
+    def test_headers(self):
+        response = self.client.get("/no-such-page/")
+        self.assertIn("X-DB-Queries", response)
+        self.assertIn("X-Response-Time-ms", response)
+
+    @override_settings(DB_QUERY_METRICS_HEADERS=False)
+    def test_no_headers_by_default_outside_debug(self):
+        with self.assertLogs("Backend.metrics", "INFO"):
+            response = self.client.get("/no-such-page/")
+        self.assertNotIn("X-DB-Queries", response)
+
+
+class DatabasePoolSettingTests(TestCase):
+    @skipIf(find_spec("psycopg") and find_spec("psycopg_pool"), "psycopg 3 pool is installed")
+    def test_pool_without_psycopg3_is_a_configuration_error(self):
+        env = {**os.environ, "DATABASE_POOL": "1"}
+        result = subprocess.run(
+            [sys.executable, "-c", "import Backend.settings"],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("ImproperlyConfigured", result.stderr)
+        self.assertIn("psycopg[pool]", result.stderr)
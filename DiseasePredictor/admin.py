@@ -1,6 +1,27 @@
 from django.contrib import admin
-from .models import SymptomDisease
+from .models import SymptomDisease, PredictionLog
 
 @admin.register(SymptomDisease)
 class SymptomDiseaseAdmin(admin.ModelAdmin):
-    list_display = ("prognosis",)
+    list_display = ("prognosis", "weight")
+
+
+@admin.register(PredictionLog)
+class PredictionLogAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "top_disease", "model_version")
+    list_filter = ("model_version",)
+    search_fields = ("top_disease",)
+    date_hierarchy = "created_at"
+    show_full_result_count = False
+    readonly_fields = ("created_at", "model_version", "symptoms", "predictions", "top_disease")
+
+    # append-only: rows are written by the predict view and removed only by
+    # `manage.py purge_prediction_log`
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
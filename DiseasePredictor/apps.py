@@ -1,6 +1,11 @@
 from django.apps import AppConfig
 
 
-class DiseasepredictorConfig(AppConfig):
+class DiseasePredictorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'DiseasePredictor'
+
+    def ready(self):
+        from . import warmup
+
+        warmup.start()
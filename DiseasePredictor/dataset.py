@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .paths import DATASET_CACHE_DIR, SUBSYM_PATH, TRAIN_CSV_PATH
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------------------------------------------
+# Schema
+# -------------------------------------------------------------------
+# Every column not listed here (symptoms and the emergency flag) is 0/1, stored as uint8.
+LABEL_COLUMN = "prognosis"
+TEXT_COLUMNS = ("tests", "medicines")
+
+CACHE_FORMAT = 2
+
+
+def schema_for(columns):
+    """read_csv dtype map for a Training.csv-style header."""
+    dtypes = {}
+    for c in columns:
+        if c == LABEL_COLUMN:
+            dtypes[c] = "category"
+        elif c in TEXT_COLUMNS:
+            dtypes[c] = str
+        else:
+            dtypes[c] = np.uint8
+    return dtypes
+
+
+# -------------------------------------------------------------------
+# Binary cache (.npz, no pickled objects)
+# -------------------------------------------------------------------
+def _source_stamp(path):
+    """(absolute path, mtime_ns, size): identifies one version of a source file."""
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+def _cache_path(source):
+    # one cache file per source path, so same-named CSVs in other directories don't collide
+    stem = os.path.splitext(os.path.basename(source))[0]
+    tag = hashlib.sha256(source.encode()).hexdigest()[:16]
+    return os.path.join(DATASET_CACHE_DIR, f"{stem}-{tag}.npz")
+
+
+def _write_cache(df, path, stamp):
+    numeric = [c for c in df.columns if c != LABEL_COLUMN and c not in TEXT_COLUMNS]
+    source, mtime_ns, size = stamp
+    arrays = {
+        "format": np.array(CACHE_FORMAT),
+        "source_path": np.array(source),
+        "source_mtime_ns": np.array(mtime_ns, dtype=np.int64),
+        "source_size": np.array(size, dtype=np.int64),
+        "columns": np.array(list(df.columns), dtype=str),
+        "numeric_columns": np.array(numeric, dtype=str),
+        "numeric": df[numeric].to_numpy(dtype=np.uint8),
+    }
+    if LABEL_COLUMN in df.columns:
+        labels = df[LABEL_COLUMN].cat
+        arrays["label_categories"] = np.array(labels.categories.astype(str).tolist(), dtype=str)
+        arrays["label_codes"] = labels.codes.to_numpy()
+    for c in TEXT_COLUMNS:
+        if c in df.columns:
+            arrays["text_" + c] = df[c].fillna("").to_numpy(dtype=str)
+            arrays["textna_" + c] = df[c].isna().to_numpy()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def _read_cache(path, stamp):
+    with np.load(path, allow_pickle=False) as z:
+        if int(z["format"]) != CACHE_FORMAT:
+            return None
+        cached = (str(z["source_path"]), int(z["source_mtime_ns"]), int(z["source_size"]))
+        if cached != stamp:
+            return None
+
+        df = pd.DataFrame(z["numeric"], columns=z["numeric_columns"].tolist())
+        if "label_codes" in z.files:
+            df[LABEL_COLUMN] = pd.Categorical.from_codes(z["label_codes"], z["label_categories"].tolist())
+        for c in TEXT_COLUMNS:
+            if "text_" + c in z.files:
+                col = pd.Series(z["text_" + c], dtype=str)
+                col[z["textna_" + c]] = np.nan
+                df[c] = col
+        return df[z["columns"].tolist()]
+
+
+# -------------------------------------------------------------------
+# Loader
+# -------------------------------------------------------------------
+def _parse_csv(path):
+    columns = pd.read_csv(path, nrows=0).columns
+    schema = schema_for(columns)
+    # read flags with inferred dtypes and check them before narrowing: a direct
+    # uint8 read silently keeps 2 and wraps 300 / -1 to 44 / 255
+    df = pd.read_csv(path, dtype={c: t for c, t in schema.items() if t is not np.uint8})
+
+    loose = []
+    for c, t in schema.items():
+        if t is not np.uint8:
+            continue
+        col = df[c]
+        if not pd.api.types.is_numeric_dtype(col):
+            # text cells (e.g. "yes"/"no"): left for build_features to coerce
+            loose.append(c)
+            continue
+        bad = ~col.isin((0, 1))
+        if bad.any():
+            row = int(np.argmax(bad.to_numpy()))
+            raise ValueError(
+                f"{os.path.basename(path)}: column {c!r} must hold 0/1, "
+                f"found {col.iloc[row]!r} on line {row + 2}"
+            )
+        df[c] = col.astype(np.uint8)
+
+    if loose:
+        logger.warning("%s has non-numeric cells in %d column(s) (%s...); using inferred dtypes",
+                       path, len(loose), ", ".join(loose[:3]))
+    return df
+
+
+_memo_lock = threading.Lock()
+_memo = {}
+
+
+def load_training_frame(path=TRAIN_CSV_PATH, use_cache=True):
+    """
+    Training.csv as a typed DataFrame: uint8 symptoms, categorical
+    prognosis, string tests / medicines.
+
+    The CSV is parsed once per (path, mtime, size); afterwards the frame
+    comes from a .npz cache in DATASET_CACHE_DIR, or from memory within
+    this process. Cells in symptom / flag columns must be 0/1 (ValueError
+    otherwise); text such as "yes"/"no" is kept for build_features.
+    Returns a copy callers may modify.
+    """
+    stamp = _source_stamp(path)
+    source = stamp[0]
+
+    with _memo_lock:
+        hit = _memo.get(source)
+        if hit is not None and hit[0] == stamp:
+            return hit[1].copy()
+
+        df = None
+        cache = _cache_path(source)
+        if use_cache and os.path.exists(cache):
+            try:
+                df = _read_cache(cache, stamp)
+            except Exception:
+                logger.exception("ignoring unreadable dataset cache %s", cache)
+
+        if df is None:
+            df = _parse_csv(path)
+            typed = all(df[c].dtype == np.uint8 for c in df.columns
+                        if c != LABEL_COLUMN and c not in TEXT_COLUMNS)
+            if use_cache and typed and LABEL_COLUMN in df.columns:
+                _write_cache(df, cache, stamp)
+
+        _memo[source] = (stamp, df)
+        return df.copy()
+
+
+_subsym_lock = threading.Lock()
+_subsym_cache = {"key": None, "data": None}
+
+
+def load_subsymptoms(path=SUBSYM_PATH):
+    """Parsed subsymptoms.json, re-read only when the file changes (treat as read-only)."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _subsym_lock:
+        if _subsym_cache["key"] != key:
+            with open(path, "r", encoding="utf-8") as f:
+                _subsym_cache["data"] = json.load(f)
+            _subsym_cache["key"] = key
+        return _subsym_cache["data"]
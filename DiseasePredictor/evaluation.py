@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .dataset import load_training_frame
+from .inference import top_k
+from .paths import EVAL_CACHE_DIR
+from .registry import active_version, check_version, load_version
+from .training import build_features
+
+
+# -------------------------------------------------------------------
+# Datasets
+# -------------------------------------------------------------------
+class EvalDataset:
+    """
+    Replay input: a feature frame plus optional labels (None for logged
+    predictions, which have no ground truth).
+    """
+
+    def __init__(self, name, X, y=None):
+        self.name = name
+        self.X = X
+        self.y = None if y is None else np.asarray(y, dtype=object)
+
+    @classmethod
+    def from_csv(cls, path, name=None):
+        X, y = build_features(load_training_frame(path))
+        return cls(name or os.path.basename(path), X, y)
+
+    @classmethod
+    def from_symptom_lists(cls, name, symptom_lists):
+        rows = [{str(s).lower().strip().replace(" ", "_"): 1 for s in syms if s} for syms in symptom_lists]
+        return cls(name, pd.DataFrame(rows).fillna(0))
+
+    @classmethod
+    def from_prediction_log(cls, limit=100000, since=None):
+        from .models import PredictionLog
+
+        qs = PredictionLog.objects.order_by("-created_at")
+        if since is not None:
+            qs = qs.filter(created_at__gte=since)
+        symptoms = list(qs.values_list("symptoms", flat=True)[:limit])
+        return cls.from_symptom_lists("prediction_log", symptoms)
+
+    def aligned(self, cols):
+        """Features reindexed to a model's column order (missing -> 0)."""
+        lower = {c.lower(): c for c in self.X.columns}
+        X = self.X.rename(columns={lower[c.lower()]: c for c in cols if c.lower() in lower})
+        return X.reindex(columns=cols, fill_value=0).to_numpy(dtype=np.float64)
+
+    def digest(self):
+        h = hashlib.sha256()
+        h.update(",".join(map(str, self.X.columns)).encode())
+        h.update(np.ascontiguousarray(self.X.to_numpy(dtype=np.float64)).tobytes())
+        if self.y is not None:
+            h.update("\x00".join(map(str, self.y)).encode())
+        return h.hexdigest()[:16]
+
+
+# -------------------------------------------------------------------
+# Evaluation
+# -------------------------------------------------------------------
+def _percentiles(values):
+    if len(values) == 0:
+        return {}
+    p = np.percentile(values, [50, 90, 99]) * 1000
+    return {"p50_ms": float(p[0]), "p90_ms": float(p[1]), "p99_ms": float(p[2]), "max_ms": float(np.max(values) * 1000)}
+
+
+def _predict_batched(clf, cols, X, batch_size):
+    """Probabilities plus per-batch wall time; batches keep feature names."""
+    probs = []
+    batch_times = []
+    for start in range(0, len(X), batch_size):
+        chunk = pd.DataFrame(X[start:start + batch_size], columns=cols)
+        t = time.perf_counter()
+        probs.append(clf.predict_proba(chunk))
+        batch_times.append(time.perf_counter() - t)
+    return np.vstack(probs), np.array(batch_times)
+
+
+def _single_row_latency(clf, cols, X, n):
+    times = []
+    for i in range(min(n, len(X))):
+        row = pd.DataFrame(X[i:i + 1], columns=cols)
+        t = time.perf_counter()
+        clf.predict_proba(row)
+        times.append(time.perf_counter() - t)
+    return np.array(times)
+
+
+def evaluate(version, dataset, k=5, batch_size=1024, latency_samples=200):
+    """
+    Replay dataset through a stored model version. Reports throughput,
+    batch and single-row latency percentiles and, when the dataset has
+    labels, accuracy, top-k accuracy and per-class recall.
+    """
+    clf, cols, le = load_version(version)
+    X = dataset.aligned(cols)
+    if len(X) == 0:
+        raise ValueError(f"Dataset {dataset.name} is empty.")
+
+    probs, batch_times = _predict_batched(clf, cols, X, batch_size)
+    idx = top_k(probs, k)[0]
+
+    report = {
+        "version": version,
+        "dataset": dataset.name,
+        "rows": int(len(X)),
+        "k": int(idx.shape[1]),
+        "rows_per_second": float(len(X) / batch_times.sum()) if batch_times.sum() else None,
+        "batch_latency": _percentiles(batch_times),
+        "single_row_latency": _percentiles(_single_row_latency(clf, cols, X, latency_samples)),
+        "top1": [str(c) for c in le.classes_[idx[:, 0]]],
+    }
+
+    if dataset.y is not None:
+        known = np.isin(dataset.y, le.classes_)
+        y = np.full(len(dataset.y), -1)
+        y[known] = le.transform(dataset.y[known])
+
+        hit1 = idx[:, 0] == y
+        hitk = (idx == y[:, None]).any(axis=1)
+        n_classes = len(le.classes_)
+        support = np.bincount(y[known], minlength=n_classes)
+        correct = np.bincount(y[hit1], minlength=n_classes)
+
+        report.update({
+            "accuracy": float(hit1.mean()),
+            "top_k_accuracy": float(hitk.mean()),
+            "unknown_labels": int((~known).sum()),
+            "per_class_recall": {
+                str(le.classes_[c]): float(correct[c] / support[c]) for c in np.flatnonzero(support)
+            },
+        })
+    return report
+
+
+# -------------------------------------------------------------------
+# Cached runs / comparison
+# -------------------------------------------------------------------
+def cached_evaluate(version, dataset, k=5, batch_size=1024, refresh=False):
+    """evaluate(), memoized on disk per (model version, dataset hash, k)."""
+    version = check_version(version)
+    version = version if version not in (None, "", "active") else active_version()
+    if version is None:
+        raise ValueError("No active model; train one first.")
+    key = f"{version}_{dataset.digest()}_k{k}"
+    path = os.path.join(EVAL_CACHE_DIR, key + ".json")
+
+    if not refresh and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    report = evaluate(version, dataset, k=k, batch_size=batch_size)
+    report["dataset_hash"] = dataset.digest()
+
+    os.makedirs(EVAL_CACHE_DIR, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(report, f)
+    os.replace(path + ".tmp", path)
+    return report
+
+
+def compare(version_a, version_b, dataset, k=5, batch_size=1024, refresh=False):
+    """Two versions side by side, plus how often their top-1 answers agree."""
+    a = cached_evaluate(version_a, dataset, k=k, batch_size=batch_size, refresh=refresh)
+    b = cached_evaluate(version_b, dataset, k=k, batch_size=batch_size, refresh=refresh)
+    agree = float(np.mean(np.array(a["top1"]) == np.array(b["top1"]))) if a["rows"] else None
+
+    diff = {}
+    for key in ("accuracy", "top_k_accuracy", "rows_per_second"):
+        if a.get(key) is not None and b.get(key) is not None:
+            diff[key] = b[key] - a[key]
+
+    return {
+        "a": summary(a, per_class=False),
+        "b": summary(b, per_class=False),
+        "top1_agreement": agree,
+        "b_minus_a": diff,
+    }
+
+
+def summary(report, per_class=True):
+    """Report without the per-row top-1 answers (kept only for comparisons)."""
+    skip = {"top1"} if per_class else {"top1", "per_class_recall"}
+    return {key: v for key, v in report.items() if key not in skip}
@@ -0,0 +1,203 @@
+import copy
+import io
+
+import numpy as np
+
+from joblib import dump
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.tree._tree import TREE_LEAF, TREE_UNDEFINED, Tree
+
+from .inference import top_k
+from .knn import HammingKNNClassifier
+
+
+# -------------------------------------------------------------------
+# Reduced-precision linear model
+# -------------------------------------------------------------------
+class QuantizedLinear:
+    """
+    Logistic-regression weights stored as float32, or int8 with one float32
+    scale per class. predict_proba matches LogisticRegression's output.
+    """
+
+    def __init__(self, coef, intercept, classes, mode="float32"):
+        coef = np.asarray(coef, dtype=np.float32)
+        self.mode = mode
+        self.classes_ = np.asarray(classes)
+        self.intercept_ = np.asarray(intercept, dtype=np.float32)
+
+        if mode == "int8":
+            scale = np.abs(coef).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            self.coef_q = np.round(coef / scale[:, None]).astype(np.int8)
+            self.scale = scale.astype(np.float32)
+        elif mode == "float32":
+            self.coef_q = coef
+            self.scale = None
+        else:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+
+    @classmethod
+    def from_model(cls, clf, mode="float32"):
+        return cls(clf.coef_, clf.intercept_, clf.classes_, mode=mode)
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        logits = X @ self.coef_q.T.astype(np.float32, copy=False)
+        if self.scale is not None:
+            logits *= self.scale
+        return logits + self.intercept_
+
+    def predict_proba(self, X):
+        z = self.decision_function(X)
+        if z.shape[1] == 1:
+            p = 1.0 / (1.0 + np.exp(-z[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        z -= z.max(axis=1, keepdims=True)
+        np.exp(z, out=z)
+        z /= z.sum(axis=1, keepdims=True)
+        return z
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# -------------------------------------------------------------------
+# Depth-capped trees / forests
+# -------------------------------------------------------------------
+def _prune_tree(tree, max_depth):
+    """
+    Copy of a fitted sklearn Tree with every node below max_depth removed.
+    Internal nodes already hold the class distribution of the samples that
+    reach them, so a cut node becomes a leaf predicting exactly that.
+    """
+    state = tree.__getstate__()
+    nodes = state["nodes"]
+    left, right = nodes["left_child"], nodes["right_child"]
+
+    keep = []
+    depth = {0: 0}
+    stack = [0]
+    while stack:
+        i = stack.pop()
+        keep.append(i)
+        if left[i] != TREE_LEAF and depth[i] < max_depth:
+            for child in (left[i], right[i]):
+                depth[child] = depth[i] + 1
+                stack.append(child)
+    keep.sort()
+    new_id = {old: new for new, old in enumerate(keep)}
+
+    kept = nodes[keep].copy()
+    for n, old in zip(kept, keep):
+        if left[old] == TREE_LEAF or depth[old] >= max_depth:
+            n["left_child"] = n["right_child"] = TREE_LEAF
+            n["feature"] = TREE_UNDEFINED
+            n["threshold"] = TREE_UNDEFINED
+        else:
+            n["left_child"] = new_id[left[old]]
+            n["right_child"] = new_id[right[old]]
+
+    pruned = Tree(tree.n_features, np.asarray(tree.n_classes, dtype=np.intp), tree.n_outputs)
+    pruned.__setstate__({
+        "max_depth": min(state["max_depth"], max_depth),
+        "node_count": len(keep),
+        "nodes": kept,
+        "values": state["values"][keep].copy(),
+    })
+    return pruned
+
+
+def _prune_estimator(est, max_depth):
+    est = copy.deepcopy(est)
+    if max_depth is not None:
+        est.tree_ = _prune_tree(est.tree_, int(max_depth))
+        est.max_depth = int(max_depth)
+    return est
+
+
+def cap_trees(clf, max_depth=None, n_estimators=None):
+    """
+    Prune an already fitted tree or forest: cut every tree at max_depth
+    and/or keep only the first n_estimators trees. Nothing is refit, so the
+    result is a reduced copy of the served model, not a new one.
+    """
+    if isinstance(clf, DecisionTreeClassifier):
+        return _prune_estimator(clf, max_depth)
+
+    capped = copy.copy(clf)
+    estimators = clf.estimators_
+    if n_estimators is not None:
+        estimators = estimators[:max(1, int(n_estimators))]
+    capped.estimators_ = [_prune_estimator(e, max_depth) for e in estimators]
+    capped.n_estimators = len(capped.estimators_)
+    if max_depth is not None:
+        capped.max_depth = int(max_depth)
+    return capped
+
+
+# -------------------------------------------------------------------
+# Validation
+# -------------------------------------------------------------------
+def topk_agreement(ref_probs, new_probs, k=5):
+    """
+    Compare two probability matrices: share of rows with the same top-1
+    class, and how much of the reference top-k set the new top-k keeps.
+    Only reference classes with non-zero probability count towards the
+    top-k overlap (ties at zero are ordered arbitrarily).
+    """
+    ref_idx, ref_vals, _ = top_k(ref_probs, k)
+    new = top_k(new_probs, k)[0]
+    k = ref_idx.shape[1]
+
+    top1 = float(np.mean(ref_idx[:, 0] == new[:, 0]))
+    relevant = ref_vals > 0
+    hits = (ref_idx[:, :, None] == new[:, None, :]).any(axis=2) & relevant
+    n_relevant = relevant.sum(axis=1)
+    overlap = np.where(n_relevant > 0, hits.sum(axis=1) / np.maximum(n_relevant, 1), 1.0)
+    return {"top1": top1, "topk": float(overlap.mean()), "k": k}
+
+
+def artifact_size(obj):
+    buf = io.BytesIO()
+    dump(obj, buf)
+    return buf.tell()
+
+
+def reduce_model(clf, mode="float32", max_depth=None, n_estimators=None):
+    """Build the reduced counterpart of a fitted model, by model type."""
+    if isinstance(clf, LogisticRegression):
+        return QuantizedLinear.from_model(clf, mode=mode)
+    if isinstance(clf, KNeighborsClassifier):
+        return HammingKNNClassifier.from_sklearn(clf)
+    if isinstance(clf, (RandomForestClassifier, DecisionTreeClassifier)):
+        if max_depth is None and n_estimators is None:
+            max_depth = 12
+        return cap_trees(clf, max_depth=max_depth, n_estimators=n_estimators)
+    raise ValueError(f"No reduced export for {type(clf).__name__}")
+
+
+def export_model(clf, X, k=5, min_agreement=0.99, min_topk_agreement=0.95, **options):
+    """
+    Reduce clf and validate it against the original on X. Returns
+    (reduced_model, report); report["passed"] says whether it may be
+    published: top-1 agreement must reach min_agreement and top-k overlap
+    min_topk_agreement.
+    """
+    reduced = reduce_model(clf, **options)
+    agreement = topk_agreement(clf.predict_proba(X), reduced.predict_proba(X), k=k)
+
+    report = {
+        "model": type(clf).__name__,
+        "reduced": type(reduced).__name__,
+        "agreement": agreement,
+        "size_bytes": artifact_size(clf),
+        "reduced_size_bytes": artifact_size(reduced),
+        "min_agreement": min_agreement,
+        "min_topk_agreement": min_topk_agreement,
+        "passed": agreement["top1"] >= min_agreement and agreement["topk"] >= min_topk_agreement,
+    }
+    return reduced, report
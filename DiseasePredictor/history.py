@@ -0,0 +1,110 @@
+import atexit
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------------------
+# Buffered prediction log writer
+# -------------------------------------------------------------------
+class PredictionLogWriter:
+    """
+    Collects PredictionLog rows in memory and inserts them from a background
+    thread with bulk_create, every batch_size rows or flush_seconds.
+
+    log() never blocks the request: when the buffer is full the entry is
+    dropped and counted in stats["dropped"].
+    """
+
+    def __init__(self, batch_size=500, flush_seconds=2.0, max_queue=10000):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.stats = {"written": 0, "dropped": 0, "failed": 0}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+                self._thread.start()
+
+    def log(self, model_version, symptoms, predictions):
+        self._ensure_thread()
+        entry = {
+            "created_at": timezone.now(),
+            "model_version": model_version,
+            "symptoms": list(symptoms),
+            "predictions": [{"disease": p["disease"], "prob": p["prob"]} for p in predictions],
+            "top_disease": predictions[0]["disease"] if predictions else "",
+        }
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _drain(self, first=None):
+        batch = [] if first is None else [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from .models import PredictionLog
+
+        if not batch:
+            return
+        try:
+            PredictionLog.objects.bulk_create([PredictionLog(**e) for e in batch])
+            self.stats["written"] += len(batch)
+        except Exception:
+            self.stats["failed"] += len(batch)
+            logger.exception("prediction log flush failed (%d rows lost)", len(batch))
+        finally:
+            close_old_connections()
+
+    def _run(self):
+        while True:
+            try:
+                first = self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def flush(self):
+        """Write everything buffered so far from the calling thread."""
+        while not self.queue.empty():
+            self._write(self._drain())
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def prediction_log_enabled():
+    return getattr(settings, "PREDICTION_LOG_ENABLED", False)
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PredictionLogWriter(
+                batch_size=getattr(settings, "PREDICTION_LOG_BATCH_SIZE", 500),
+                flush_seconds=getattr(settings, "PREDICTION_LOG_FLUSH_SECONDS", 2.0),
+                max_queue=getattr(settings, "PREDICTION_LOG_MAX_QUEUE", 10000),
+            )
+            atexit.register(_writer.flush)
+        return _writer
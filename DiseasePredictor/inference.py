@@ -0,0 +1,186 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from joblib import load as joblib_load
+
+from .dataset import load_training_frame
+
+
+# -------------------------------------------------------------------
+# Top-k ranking
+# -------------------------------------------------------------------
+def top_k(probs, k=5, min_prob=0.0):
+    """
+    Rank the k most likely classes for every row of a (n_rows, n_classes)
+    probability matrix.
+
+    Uses argpartition so the cost per row is O(C + k log k) instead of a
+    full O(C log C) sort. Returns (indices, values, mask) arrays of shape
+    (n_rows, k); mask is False where the probability is below min_prob.
+    """
+    probs = np.atleast_2d(np.asarray(probs))
+    n_classes = probs.shape[1]
+    k = max(0, min(int(k), n_classes))
+
+    if k == 0:
+        empty = np.empty((probs.shape[0], 0))
+        return empty.astype(np.intp), empty, empty.astype(bool)
+
+    if k < n_classes:
+        part = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(n_classes), probs.shape)
+
+    part_vals = np.take_along_axis(probs, part, axis=1)
+    order = np.argsort(-part_vals, axis=1, kind="stable")
+
+    idx = np.take_along_axis(part, order, axis=1)
+    vals = np.take_along_axis(part_vals, order, axis=1)
+    mask = vals >= min_prob
+    return idx, vals, mask
+
+
+# -------------------------------------------------------------------
+# Class metadata, index-aligned with the label encoder
+# -------------------------------------------------------------------
+def _split_meta(value):
+    return [v.strip() for v in str(value).split("|") if v.strip()]
+
+
+class ClassIndex:
+    """
+    Disease names and their tests / medicines / emergency flag stored as
+    arrays aligned with the label encoder, so a ranked index resolves to
+    a response row without any per-request lookups.
+    """
+
+    def __init__(self, names, tests, medicines, emergency):
+        self.names = np.asarray(names, dtype=object)
+        self.tests = tests
+        self.medicines = medicines
+        self.emergency = np.asarray(emergency, dtype=bool)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, classes, meta_df=None):
+        names = [str(c) for c in classes]
+        tests = [[] for _ in names]
+        medicines = [[] for _ in names]
+        emergency = np.zeros(len(names), dtype=bool)
+
+        if meta_df is not None and "prognosis" in meta_df.columns:
+            pos = {n.strip().lower(): i for i, n in enumerate(names)}
+            meta_df = meta_df.drop_duplicates("prognosis", keep="last")
+            for _, r in meta_df.iterrows():
+                i = pos.get(str(r["prognosis"]).strip().lower())
+                if i is None:
+                    continue
+                tests[i] = _split_meta(r.get("tests", ""))
+                medicines[i] = _split_meta(r.get("medicines", ""))
+                try:
+                    emergency[i] = bool(int(r.get("emergency", 0)))
+                except (TypeError, ValueError):
+                    emergency[i] = False
+
+        return cls(names, tests, medicines, emergency)
+
+    def rows(self, idx, vals, mask=None):
+        """Resolve one ranked row of class indices into response dicts."""
+        out = []
+        for j, (i, p) in enumerate(zip(idx, vals)):
+            if mask is not None and not mask[j]:
+                continue
+            out.append({
+                "disease": self.names[i],
+                "prob": float(p),
+                "tests": self.tests[i],
+                "medicines": self.medicines[i],
+                "emergency": bool(self.emergency[i]),
+            })
+        return out
+
+
+# -------------------------------------------------------------------
+# Cached model bundle
+# -------------------------------------------------------------------
+class ModelBundle:
+    """Classifier, feature columns and class index loaded together."""
+
+    def __init__(self, clf, cols, classes, version=""):
+        self.clf = clf
+        self.version = version
+        self.cols = list(cols)
+        self.col_pos = {c.lower(): i for i, c in enumerate(self.cols)}
+        self.classes = classes
+
+    def vectorize(self, symptom_lists):
+        """Build a (n_rows, n_features) input frame from lists of symptom names."""
+        X = np.zeros((len(symptom_lists), len(self.cols)), dtype=np.float64)
+        for r, symptoms in enumerate(symptom_lists):
+            for s in {str(s).lower().strip() for s in symptoms if s}:
+                i = self.col_pos.get(s)
+                if i is None:
+                    i = self.col_pos.get(s.replace(" ", "_"))
+                if i is not None:
+                    X[r, i] = 1
+        return pd.DataFrame(X, columns=self.cols)
+
+    def predict_proba(self, symptom_lists):
+        return self.clf.predict_proba(self.vectorize(symptom_lists))
+
+
+_bundle_lock = threading.Lock()
+_bundle_cache = {"key": None, "bundle": None}
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def file_digest(path, length=12):
+    """Short sha256 of a file, used as the model version id."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:length]
+
+
+def load_bundle(model_path, cols_path, le_path, csv_path=None):
+    """
+    Return the ModelBundle for the given artifacts, reloading only when one
+    of the files changes on disk (e.g. after /train/).
+    """
+    paths = (model_path, cols_path, le_path, csv_path)
+    key = tuple((p, _mtime(p)) for p in paths if p)
+
+    with _bundle_lock:
+        if _bundle_cache["key"] == key:
+            return _bundle_cache["bundle"]
+
+        clf = joblib_load(model_path)
+        cols = joblib_load(cols_path)
+        le = joblib_load(le_path)
+
+        meta_df = None
+        if csv_path and os.path.exists(csv_path):
+            try:
+                meta_df = load_training_frame(csv_path)
+            except Exception:
+                meta_df = None
+
+        bundle = ModelBundle(
+            clf, cols, ClassIndex.build(le.classes_, meta_df), version=file_digest(model_path)
+        )
+        _bundle_cache["key"] = key
+        _bundle_cache["bundle"] = bundle
+        return bundle
@@ -0,0 +1,149 @@
+import numpy as np
+
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+
+# -------------------------------------------------------------------
+# Bit packing
+# -------------------------------------------------------------------
+def pack_rows(X):
+    """
+    Binarize X (> 0.5) and pack every row into uint64 words, zero-padded to
+    a whole number of words. Returns an (n_rows, n_words) array.
+    """
+    bits = np.asarray(X) > 0.5
+    packed = np.packbits(bits, axis=1)
+    pad = (-packed.shape[1]) % 8
+    if pad:
+        packed = np.pad(packed, ((0, 0), (0, pad)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def popcount(words):
+    """Number of set bits per row of a uint64 array."""
+    return np.bitwise_count(words).sum(axis=-1, dtype=np.int32)
+
+
+# -------------------------------------------------------------------
+# Estimator
+# -------------------------------------------------------------------
+class HammingKNNClassifier(ClassifierMixin, BaseEstimator):
+    """
+    k-nearest-neighbours for binary symptom vectors.
+
+    Training rows are stored bit-packed in uint64 words and compared with
+    XOR/AND/OR + popcount, so a query costs n_rows * n_words word ops
+    instead of a float64 distance over every feature.
+
+    metric: "hamming" (differing bits) or "jaccard" (1 - |a&b| / |a|b|).
+    dedupe: collapse identical (row, label) pairs into one weighted row.
+    Each row's weight (multiplicity x sample_weight) counts towards the
+    k neighbours and its vote.
+
+    Neighbours at equal distance are taken in training order. Predictions
+    match KNeighborsClassifier except when several rows tie at the k-th
+    distance: sklearn's order for those depends on its search backend (its
+    brute force on integer input also uses training order, so there the
+    match is exact without dedupe). With dedupe a duplicated row is ranked
+    at its first occurrence.
+    """
+
+    def __init__(self, n_neighbors=5, metric="hamming", dedupe=True, chunk_size=256):
+        self.n_neighbors = n_neighbors
+        self.metric = metric
+        self.dedupe = dedupe
+        self.chunk_size = chunk_size
+
+    def fit(self, X, y, sample_weight=None):
+        if self.metric not in ("hamming", "jaccard"):
+            raise ValueError(f"Unknown metric: {self.metric}")
+
+        X = np.asarray(X)
+        y = np.asarray(y)
+        self.n_features_in_ = X.shape[1]
+        self.classes_, y_idx = np.unique(y, return_inverse=True)
+
+        packed = pack_rows(X)
+        weights = np.ones(len(y), dtype=np.float64)
+        if sample_weight is not None:
+            weights = np.asarray(sample_weight, dtype=np.float64)
+
+        if self.dedupe:
+            keys = np.column_stack([packed, y_idx.astype(np.uint64)])
+            keys, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+            # keep unique rows in order of first occurrence so distance ties
+            # are broken by training order, as sklearn's brute force does
+            order = np.argsort(first, kind="stable")
+            keys = keys[order]
+            inverse = np.argsort(order)[inverse.ravel()]
+            packed = np.ascontiguousarray(keys[:, :-1])
+            y_idx = keys[:, -1].astype(np.intp)
+            weights = np.bincount(inverse.ravel(), weights=weights, minlength=len(keys))
+
+        self.packed_ = packed
+        self.y_ = y_idx
+        self.weights_ = weights
+        self.counts_ = popcount(packed)
+        return self
+
+    @classmethod
+    def from_sklearn(cls, clf, X=None, y=None, metric="hamming", dedupe=True):
+        """
+        Build from a fitted sklearn KNeighborsClassifier. Pass the X / y it
+        was fitted on; without them the training data is read back from the
+        estimator, which only works while sklearn keeps it as _fit_X / _y.
+        """
+        model = cls(n_neighbors=clf.n_neighbors, metric=metric, dedupe=dedupe)
+        if X is not None and y is not None:
+            return model.fit(X, y)
+
+        fit_X = getattr(clf, "_fit_X", None)
+        fit_y = getattr(clf, "_y", None)
+        classes = getattr(clf, "classes_", None)
+        if not isinstance(fit_X, np.ndarray) or fit_y is None or classes is None or np.ndim(fit_y) != 1:
+            raise ValueError(f"Cannot read the training data back from {type(clf).__name__}; pass X and y.")
+        return model.fit(fit_X, classes[fit_y])
+
+    def _distances(self, q):
+        if self.metric == "hamming":
+            return popcount(q[:, None, :] ^ self.packed_[None, :, :]).astype(np.float64)
+
+        # |a|b| = |a| + |b| - |a&b|, with |b| precomputed at fit time
+        inter = popcount(q[:, None, :] & self.packed_[None, :, :])
+        union = popcount(q)[:, None] + self.counts_[None, :] - inter
+        with np.errstate(invalid="ignore", divide="ignore"):
+            d = 1.0 - inter / union
+        d[union == 0] = 0.0
+        return d
+
+    def predict_proba(self, X):
+        q = pack_rows(X)
+        n_ref = len(self.y_)
+        k = self.n_neighbors
+        m = min(k, n_ref)
+        out = np.zeros((q.shape[0], len(self.classes_)))
+
+        for start in range(0, q.shape[0], self.chunk_size):
+            chunk = q[start:start + self.chunk_size]
+            dist = self._distances(chunk)
+
+            # k nearest unique rows always cover the k nearest weighted rows
+            if m < n_ref:
+                nn = np.argpartition(dist, m - 1, axis=1)[:, :m]
+            else:
+                nn = np.tile(np.arange(n_ref), (len(chunk), 1))
+            order = np.argsort(np.take_along_axis(dist, nn, axis=1), axis=1, kind="stable")
+            nn = np.take_along_axis(nn, order, axis=1)
+
+            w = self.weights_[nn]
+            before = np.cumsum(w, axis=1) - w
+            take = np.clip(np.minimum(w, k - before), 0, None)
+
+            votes = np.zeros((len(chunk), len(self.classes_)))
+            np.add.at(votes, (np.arange(len(chunk))[:, None], self.y_[nn]), take)
+            out[start:start + len(chunk)] = votes / votes.sum(axis=1, keepdims=True)
+
+        return out
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+
+# -------------------------------------------------------------------
+# Minimal asyncio HTTP/1.1 client (no dependencies)
+# -------------------------------------------------------------------
+class HTTPConnection:
+    """
+    One client connection. Without keepalive every request opens a new
+    socket, as browsers hitting gunicorn's sync workers effectively do
+    (and it avoids the Nagle / delayed-ACK stall runserver shows on
+    reused connections).
+    """
+
+    def __init__(self, host, port, keepalive=False):
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        """Returns (status, body bytes). Reconnects once if the server dropped us."""
+        for attempt in (0, 1):
+            if self.writer is None:
+                await self._connect()
+            try:
+                return await self._roundtrip(method, path, body, headers or {})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _roundtrip(self, method, path, body, headers):
+        data = b"" if body is None else json.dumps(body).encode()
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Connection: keep-alive" if self.keepalive else "Connection: close",
+            f"Content-Length: {len(data)}",
+        ]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + data)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split()[1])
+        resp_headers = {}
+        for line in header_lines:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                resp_headers[k.strip().lower()] = v.strip()
+
+        if resp_headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = b""
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                payload += chunk[:-2]
+        elif "content-length" in resp_headers:
+            payload = await self.reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            payload = await self.reader.read()
+
+        read_to_eof = "content-length" not in resp_headers and "transfer-encoding" not in resp_headers
+        if not self.keepalive or read_to_eof or resp_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, payload
+
+
+# -------------------------------------------------------------------
+# Scenario
+# -------------------------------------------------------------------
+DEFAULT_MIX = {"predict": 60, "symptoms": 10, "subsymptoms": 10, "login": 5, "doctors": 15}
+
+
+def parse_mix(text):
+    """"predict=60,doctors=15" -> {"predict": 60, "doctors": 15}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Scenario:
+    """Builds realistic requests for each endpoint name in the mix."""
+
+    def __init__(self, mix, symptoms, username=None, password=None, specializations=None, seed=0):
+        self.names = list(mix)
+        weights = np.array([mix[n] for n in self.names], dtype=float)
+        self.weights = weights / weights.sum()
+        self.symptoms = symptoms
+        self.username = username
+        self.password = password
+        self.specializations = specializations or ["All", "Surgeon", "Radiologist", "Cardiologist"]
+        self.rng = random.Random(seed)
+
+    def next(self):
+        name = self.rng.choices(self.names, weights=self.weights)[0]
+        if name == "predict":
+            picked = self.rng.sample(self.symptoms, k=min(len(self.symptoms), self.rng.randint(2, 6)))
+            return name, "POST", "/api/disease/predict/", {"symptoms": picked}
+        if name == "symptoms":
+            return name, "GET", "/api/disease/symptoms/", None
+        if name == "subsymptoms":
+            return name, "GET", "/api/disease/subsymptoms/", None
+        if name == "login":
+            return name, "POST", "/api/accounts/login/", {"username": self.username, "password": self.password}
+        spec = self.rng.choice(self.specializations)
+        return name, "GET", f"/api/accounts/doctors/?specialization={spec}", None
+
+
+# -------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------
+def _latency_summary(samples):
+    if not samples:
+        return {"count": 0}
+    ms = np.asarray(samples) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "count": int(len(ms)),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "max_ms": float(ms.max()),
+    }
+
+
+async def _worker(host, port, scenario, deadline, results, keepalive):
+    conn = HTTPConnection(host, port, keepalive)
+    try:
+        while time.perf_counter() < deadline:
+            name, method, path, body = scenario.next()
+            start = time.perf_counter()
+            try:
+                status, _ = await conn.request(method, path, body)
+                error = None if status < 400 else f"HTTP {status}"
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                error = type(e).__name__
+                await conn.close()
+            elapsed = time.perf_counter() - start
+
+            entry = results.setdefault(name, {"latencies": [], "errors": 0, "error_kinds": {}})
+            entry["latencies"].append(elapsed)
+            if error is not None:
+                entry["errors"] += 1
+                entry["error_kinds"][error] = entry["error_kinds"].get(error, 0) + 1
+                # brief back-off so a failing server is not hammered in a tight loop
+                await asyncio.sleep(0.01)
+    finally:
+        await conn.close()
+
+
+async def run_level(base_url, scenario, concurrency, duration, keepalive=False):
+    """Drive the mix with `concurrency` clients for `duration` seconds."""
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    results = {}
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[_worker(host, port, scenario, deadline, results, keepalive) for _ in range(concurrency)])
+    wall = time.perf_counter() - start
+
+    endpoints = {}
+    all_latencies = []
+    total = errors = 0
+    for name, entry in sorted(results.items()):
+        n = len(entry["latencies"])
+        total += n
+        errors += entry["errors"]
+        all_latencies += entry["latencies"]
+        endpoints[name] = {
+            **_latency_summary(entry["latencies"]),
+            "rps": n / wall,
+            "error_rate": entry["errors"] / n if n else 0.0,
+            "errors": entry["error_kinds"],
+        }
+
+    return {
+        "concurrency": concurrency,
+        "seconds": wall,
+        "requests": total,
+        "rps": total / wall,
+        "error_rate": errors / total if total else 0.0,
+        "latency": _latency_summary(all_latencies),
+        "endpoints": endpoints,
+    }
+
+
+async def fetch_json(base_url, path):
+    url = urlsplit(base_url)
+    conn = HTTPConnection(url.hostname, url.port or 80)
+    try:
+        status, body = await conn.request("GET", path)
+    finally:
+        await conn.close()
+    if status >= 400:
+        raise RuntimeError(f"GET {path} -> HTTP {status}")
+    return json.loads(body)
+
+
+def capacity(levels, slo_p99_ms, max_error_rate):
+    """Highest-throughput level that met the p99 and error-rate targets."""
+    passing = [
+        lvl for lvl in levels
+        if lvl["latency"].get("p99_ms", float("inf")) <= slo_p99_ms and lvl["error_rate"] <= max_error_rate
+    ]
+    if not passing:
+        return None
+    best = max(passing, key=lambda lvl: lvl["rps"])
+    return {"concurrency": best["concurrency"], "rps": best["rps"], "p99_ms": best["latency"]["p99_ms"]}
+
+
+def compare_reports(old, new):
+    """Per-concurrency throughput / p99 change between two capacity reports."""
+    old_levels = {lvl["concurrency"]: lvl for lvl in old.get("levels", [])}
+    rows = []
+    for lvl in new.get("levels", []):
+        prev = old_levels.get(lvl["concurrency"])
+        if prev is None:
+            continue
+        rows.append({
+            "concurrency": lvl["concurrency"],
+            "rps_change_pct": 100.0 * (lvl["rps"] - prev["rps"]) / prev["rps"] if prev["rps"] else None,
+            "p99_ms_old": prev["latency"].get("p99_ms"),
+            "p99_ms_new": lvl["latency"].get("p99_ms"),
+        })
+    return {
+        "capacity_old": old.get("capacity"),
+        "capacity_new": new.get("capacity"),
+        "levels": rows,
+    }
@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from DiseasePredictor.evaluation import EvalDataset, cached_evaluate, compare, summary
+from DiseasePredictor.paths import TRAIN_CSV_PATH
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a labelled CSV (default Training.csv) or the prediction log through a "
+        "stored model version and print accuracy, top-k accuracy, per-class recall "
+        "and latency; with --compare, two versions side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", default="active", help="Model version (default: the active one).")
+        parser.add_argument("--compare", help="Second model version.")
+        parser.add_argument("--csv", default=TRAIN_CSV_PATH, help="Held-out CSV with a prognosis column.")
+        parser.add_argument("--log", action="store_true", help="Use logged /predict/ inputs instead of --csv.")
+        parser.add_argument("-k", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=1024)
+        parser.add_argument("--refresh", action="store_true", help="Ignore cached results.")
+
+    def handle(self, *args, **opts):
+        if opts["k"] < 1:
+            raise CommandError("-k must be at least 1.")
+        if opts["log"]:
+            dataset = EvalDataset.from_prediction_log()
+        else:
+            dataset = EvalDataset.from_csv(opts["csv"])
+
+        kwargs = {"k": opts["k"], "batch_size": opts["batch_size"], "refresh": opts["refresh"]}
+        try:
+            if opts["compare"]:
+                result = compare(opts["model"], opts["compare"], dataset, **kwargs)
+            else:
+                result = summary(cached_evaluate(opts["model"], dataset, **kwargs))
+        except (KeyError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from DiseasePredictor.loadtest import (
+    DEFAULT_MIX, Scenario, capacity, compare_reports, fetch_json, parse_mix, run_level,
+)
+from DiseasePredictor.training import METADATA_COLUMNS
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, cwd=settings.BASE_DIR
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server (runserver / gunicorn, SQLite or PostgreSQL) with a "
+        "mix of predict, symptoms, subsymptoms, login and doctors requests at "
+        "increasing concurrency and write a JSON capacity report (throughput, "
+        "p50/p90/p99 latency, error rates). --compare diffs against an earlier report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the server under test.")
+        parser.add_argument("--concurrency", default="1,4,16,32", help="Comma-separated client counts.")
+        parser.add_argument("--duration", type=float, default=15.0, help="Seconds per concurrency level.")
+        parser.add_argument(
+            "--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+            help="Endpoint weights, e.g. predict=60,doctors=15,login=5.",
+        )
+        parser.add_argument("--keepalive", action="store_true", help="Reuse one connection per client.")
+        parser.add_argument("--username", default="loadtest")
+        parser.add_argument("--password", default="loadtest-password")
+        parser.add_argument(
+            "--seed-data", type=int, metavar="N", default=0,
+            help="Create the --username account and N doctor profiles first "
+                 "(needs the same database settings as the server).",
+        )
+        parser.add_argument("--slo-p99-ms", type=float, default=500.0)
+        parser.add_argument("--max-error-rate", type=float, default=0.01)
+        parser.add_argument("--stop-on-breach", action="store_true",
+                            help="Skip higher levels once a level misses the SLO.")
+        parser.add_argument("--seed", type=int, default=0, help="RNG seed for the request mix.")
+        parser.add_argument("--output", help="Write the capacity report to this file.")
+        parser.add_argument("--compare", help="Earlier capacity report to diff against.")
+
+    def handle(self, *args, **opts):
+        try:
+            levels = [int(c) for c in opts["concurrency"].split(",") if c.strip()]
+            mix = parse_mix(opts["mix"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if not levels or min(levels) < 1:
+            raise CommandError("--concurrency needs positive integers")
+
+        if opts["seed_data"]:
+            self._seed(opts["username"], opts["password"], opts["seed_data"])
+
+        report = asyncio.run(self._run(levels, mix, opts))
+
+        if opts["compare"]:
+            with open(opts["compare"]) as f:
+                report["comparison"] = compare_reports(json.load(f), report)
+
+        text = json.dumps(report, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w") as f:
+                f.write(text)
+            self.stdout.write(f"Capacity report written to {opts['output']}")
+        self._print_table(report)
+        if not opts["output"]:
+            self.stdout.write(text)
+
+    async def _run(self, levels, mix, opts):
+        base = opts["url"].rstrip("/")
+        try:
+            names = [s["name"] for s in await fetch_json(base, "/api/disease/symptoms/")]
+        except (OSError, RuntimeError, ValueError) as e:
+            raise CommandError(f"Server at {base} is not reachable: {e}")
+        # columns.pkl also lists the metadata columns and their one-hot dummies
+        symptoms = [n for n in names if not any(n == m or n.startswith(m + "_") for m in METADATA_COLUMNS)]
+        if not symptoms and "predict" in mix:
+            raise CommandError("Server returned no symptoms; train a model first.")
+
+        scenario = Scenario(mix, symptoms, opts["username"], opts["password"], seed=opts["seed"])
+        results = []
+        for c in levels:
+            self.stderr.write(f"concurrency {c} ...")
+            level = await run_level(base, scenario, c, opts["duration"], opts["keepalive"])
+            results.append(level)
+            breached = (level["latency"].get("p99_ms", float("inf")) > opts["slo_p99_ms"]
+                        or level["error_rate"] > opts["max_error_rate"])
+            if breached and opts["stop_on_breach"]:
+                break
+
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "revision": _git_revision(),
+            "target": base,
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+            },
+            "config": {
+                "mix": mix,
+                "duration": opts["duration"],
+                "slo_p99_ms": opts["slo_p99_ms"],
+                "max_error_rate": opts["max_error_rate"],
+                "seed": opts["seed"],
+                "keepalive": opts["keepalive"],
+            },
+            "levels": results,
+            "capacity": capacity(results, opts["slo_p99_ms"], opts["max_error_rate"]),
+        }
+
+    def _seed(self, username, password, n_doctors):
+        from Accounts.models import AppUser, DoctorProfile
+
+        user, created = AppUser.objects.get_or_create(username=username)
+        if created or not user.check_password(password):
+            user.set_password(password)
+            user.save()
+
+        specializations = ["Surgeon", "Radiologist", "Cardiologist", "Dermatologist", "Neurologist"]
+        existing = DoctorProfile.objects.filter(user__username__startswith="loadtest-doctor-").count()
+        for i in range(existing, n_doctors):
+            doc = AppUser.objects.create_user(f"loadtest-doctor-{i}", password=None)
+            DoctorProfile.objects.create(user=doc, specialization=specializations[i % len(specializations)])
+        self.stderr.write(f"Seeded user {username!r} and {max(n_doctors, existing)} doctors")
+
+    def _print_table(self, report):
+        self.stdout.write(f"{'clients':>8} {'rps':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'errors':>8}")
+        for lvl in report["levels"]:
+            lat = lvl["latency"]
+            self.stdout.write(
+                f"{lvl['concurrency']:>8} {lvl['rps']:>9.1f} {lat.get('p50_ms', 0):>9.1f} "
+                f"{lat.get('p90_ms', 0):>9.1f} {lat.get('p99_ms', 0):>9.1f} {lvl['error_rate']:>8.2%}"
+            )
+        cap = report["capacity"]
+        if cap:
+            self.stdout.write(f"Capacity: {cap['rps']:.1f} req/s at {cap['concurrency']} clients "
+                              f"(p99 {cap['p99_ms']:.1f} ms)")
+        else:
+            self.stdout.write("Capacity: no level met the SLO")
+        for row in report.get("comparison", {}).get("levels", []):
+            change = row["rps_change_pct"]
+            self.stdout.write(
+                f"  vs previous @ {row['concurrency']}: rps {change:+.1f}%, "
+                f"p99 {row['p99_ms_old']:.1f} -> {row['p99_ms_new']:.1f} ms"
+                if change is not None else f"  vs previous @ {row['concurrency']}: n/a"
+            )
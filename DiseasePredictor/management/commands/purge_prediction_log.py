@@ -0,0 +1,41 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from DiseasePredictor.models import PredictionLog
+
+
+class Command(BaseCommand):
+    help = "Delete PredictionLog rows older than the retention window, in small chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int,
+            default=getattr(settings, "PREDICTION_LOG_RETENTION_DAYS", 90),
+        )
+        parser.add_argument("--chunk-size", type=int, default=10000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        cutoff = timezone.now() - timedelta(days=opts["days"])
+        old = PredictionLog.objects.filter(created_at__lt=cutoff)
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{old.count()} rows older than {cutoff:%Y-%m-%d %H:%M}")
+            return
+
+        # short deletes by primary key keep locks brief on a hot table
+        deleted = 0
+        start = time.perf_counter()
+        while True:
+            ids = list(old.order_by("id").values_list("id", flat=True)[:opts["chunk_size"]])
+            if not ids:
+                break
+            deleted += PredictionLog.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"deleted {deleted} rows older than {cutoff:%Y-%m-%d %H:%M} in {time.perf_counter() - start:.1f}s"
+        ))
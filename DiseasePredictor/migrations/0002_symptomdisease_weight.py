@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('DiseasePredictor', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='symptomdisease',
+            name='weight',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
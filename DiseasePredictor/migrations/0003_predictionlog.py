@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('DiseasePredictor', '0002_symptomdisease_weight'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('model_version', models.CharField(max_length=64)),
+                ('symptoms', models.JSONField(default=list)),
+                ('predictions', models.JSONField(default=list)),
+                ('top_disease', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['top_disease', 'created_at'], name='predlog_disease_time'), models.Index(fields=['model_version', 'created_at'], name='predlog_version_time')],
+            },
+        ),
+    ]
@@ -5,6 +5,27 @@ class SymptomDisease(models.Model):
     # We'll store the full CSV row as JSON-like text if needed, but keep some helpful fields.
     prognosis = models.CharField(max_length=255)
     raw = models.JSONField(blank=True, null=True)
+    # number of identical CSV rows this entry stands for
+    weight = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return f"{self.prognosis}"
+
+
+class PredictionLog(models.Model):
+    # append-only audit trail of /predict/ calls (opt-in, PREDICTION_LOG_ENABLED)
+    created_at = models.DateTimeField(db_index=True)
+    model_version = models.CharField(max_length=64)
+    symptoms = models.JSONField(default=list)
+    # [{"disease": ..., "prob": ...}, ...] in ranked order
+    predictions = models.JSONField(default=list)
+    top_disease = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["top_disease", "created_at"], name="predlog_disease_time"),
+            models.Index(fields=["model_version", "created_at"], name="predlog_version_time"),
+        ]
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.top_disease}"
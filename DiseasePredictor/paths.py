@@ -0,0 +1,27 @@
+import os
+
+from django.conf import settings
+
+
+# -------------------------------------------------------------------
+# Paths
+# -------------------------------------------------------------------
+BASE_DIR = settings.BASE_DIR
+APP_DIR = os.path.join(BASE_DIR, "DiseasePredictor")
+
+TRAIN_CSV_PATH = os.path.join(APP_DIR, "Training.csv")
+MODEL_PATH = os.path.join(APP_DIR, "model.pkl")
+COLS_PATH = os.path.join(APP_DIR, "columns.pkl")
+LE_PATH = os.path.join(APP_DIR, "label_encoder.pkl")
+LAST_SCORES_PATH = os.path.join(APP_DIR, "last_scores.pkl")
+MODEL_FULL_PATH = os.path.join(APP_DIR, "model_full.pkl")
+MODEL_REDUCED_PATH = os.path.join(APP_DIR, "model_reduced.pkl")
+SYMPTOM_INDEX_PATH = os.path.join(APP_DIR, "symptom_index.pkl")
+
+# every trained model is archived here as <version>/{model,columns,label_encoder}.pkl
+MODEL_STORE_DIR = os.path.join(APP_DIR, "model_store")
+EVAL_CACHE_DIR = os.path.join(APP_DIR, "eval_cache")
+# parsed CSVs as .npz, validated against the source file's sha256
+DATASET_CACHE_DIR = os.path.join(APP_DIR, "dataset_cache")
+
+SUBSYM_PATH = os.path.join(BASE_DIR, "data", "subsymptoms.json")
@@ -0,0 +1,74 @@
+import os
+import re
+import shutil
+
+from joblib import load as joblib_load
+
+from .inference import file_digest
+from .paths import COLS_PATH, LE_PATH, MODEL_PATH, MODEL_STORE_DIR
+
+ARTIFACTS = ("model.pkl", "columns.pkl", "label_encoder.pkl")
+VERSION_ID = re.compile(r"[0-9a-f]{12}")  # file_digest() of model.pkl
+
+
+# -------------------------------------------------------------------
+# Stored model versions
+# -------------------------------------------------------------------
+def active_version():
+    return file_digest(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+
+
+def archive_active():
+    """Copy the active artifacts to MODEL_STORE_DIR/<version>/; returns the version."""
+    version = active_version()
+    if version is None:
+        return None
+
+    target = os.path.join(MODEL_STORE_DIR, version)
+    if not os.path.isdir(target):
+        os.makedirs(target + ".tmp", exist_ok=True)
+        for src, name in zip((MODEL_PATH, COLS_PATH, LE_PATH), ARTIFACTS):
+            shutil.copy2(src, os.path.join(target + ".tmp", name))
+        os.replace(target + ".tmp", target)
+    return version
+
+
+def list_versions():
+    active = active_version()
+    versions = []
+    if os.path.isdir(MODEL_STORE_DIR):
+        for name in sorted(os.listdir(MODEL_STORE_DIR)):
+            path = os.path.join(MODEL_STORE_DIR, name)
+            if VERSION_ID.fullmatch(name) and os.path.isfile(os.path.join(path, "model.pkl")):
+                versions.append({
+                    "version": name,
+                    "created": os.path.getmtime(os.path.join(path, "model.pkl")),
+                    "active": name == active,
+                })
+    if active and not any(v["active"] for v in versions):
+        versions.append({"version": active, "created": os.path.getmtime(MODEL_PATH), "active": True})
+    return sorted(versions, key=lambda v: v["created"])
+
+
+def check_version(version):
+    """
+    Returns version if it is "active" (or empty) or a registry id; anything
+    else - in particular a path - raises ValueError before it reaches a
+    file name.
+    """
+    if version in (None, "", "active") or (isinstance(version, str) and VERSION_ID.fullmatch(version)):
+        return version
+    raise ValueError(f"Invalid model version: {version!r} (use 'active' or a 12-character version id).")
+
+
+def load_version(version):
+    """(clf, cols, label_encoder) for a stored version; "active" = model.pkl."""
+    check_version(version)
+    if version in (None, "", "active") or version == active_version():
+        paths = (MODEL_PATH, COLS_PATH, LE_PATH)
+    else:
+        base = os.path.join(MODEL_STORE_DIR, version)
+        paths = tuple(os.path.join(base, name) for name in ARTIFACTS)
+        if not os.path.exists(paths[0]):
+            raise KeyError(f"Unknown model version: {version}")
+    return tuple(joblib_load(p) for p in paths)
@@ -0,0 +1,151 @@
+import os
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+from joblib import dump, load as joblib_load
+
+from .training import compact
+
+
+# -------------------------------------------------------------------
+# Building
+# -------------------------------------------------------------------
+def build_index(S, labels, weights=None):
+    """
+    Precompute the related-symptoms index from a binary symptom frame S
+    (rows x symptoms), row labels and optional row weights:
+
+      cooc       symptoms x symptoms weighted co-occurrence counts (CSR)
+      cond       diseases x symptoms P(symptom | disease) (CSR)
+      prior      P(disease)
+    """
+    symptoms = [str(c) for c in S.columns]
+    X = sp.csr_matrix((S.to_numpy() > 0.5).astype(np.float32))
+    w = np.ones(X.shape[0], dtype=np.float32) if weights is None else np.asarray(weights, dtype=np.float32)
+
+    diseases, y = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+    # rows -> diseases, weighted
+    D = sp.csr_matrix((w, (y, np.arange(len(y)))), shape=(len(diseases), len(y)))
+
+    disease_weight = np.asarray(D.sum(axis=1)).ravel()
+    cond = sp.diags(1.0 / np.maximum(disease_weight, 1e-12)) @ (D @ X)
+    cooc = (X.T @ sp.diags(w) @ X).tocsr()
+    cooc.setdiag(0)
+    cooc.eliminate_zeros()
+
+    return {
+        "symptoms": symptoms,
+        "diseases": [str(d) for d in diseases],
+        "cooc": cooc,
+        "cond": sp.csr_matrix(cond, dtype=np.float32),
+        "prior": (disease_weight / disease_weight.sum()).astype(np.float64),
+    }
+
+
+def index_from_frame(df, label_col="prognosis", exclude=()):
+    """Build the index from a Training.csv-style frame, compacting duplicate rows first."""
+    cols = [c for c in df.columns if c != label_col and c not in exclude]
+    S, labels, weights, _ = compact(df[cols], df[label_col])
+    return build_index(S, labels, weights)
+
+
+def save_index(index, path):
+    # write-then-rename so concurrent workers never load a half-written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    dump(index, tmp)
+    os.replace(tmp, path)
+
+
+_index_lock = threading.Lock()
+_index_cache = {"key": None, "index": None}
+
+
+def load_index(path):
+    """Load the index once per file version (mtime)."""
+    key = (path, os.path.getmtime(path))
+    with _index_lock:
+        if _index_cache["key"] != key:
+            index = joblib_load(path)
+            index["pos"] = {s.lower(): i for i, s in enumerate(index["symptoms"])}
+            index["cond_dense"] = index["cond"].toarray().astype(np.float32)
+            _index_cache["key"] = key
+            _index_cache["index"] = index
+        return _index_cache["index"]
+
+
+# -------------------------------------------------------------------
+# Querying
+# -------------------------------------------------------------------
+def _entropy(p, axis=0):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -np.where(p > 0, p * np.log2(p), 0.0)
+    return h.sum(axis=axis)
+
+
+def related(index, selected, limit=10, eps=1e-3):
+    """
+    Rank unselected symptoms by expected information gain about the disease
+    given the selected ones (naive-Bayes posterior over the precomputed
+    P(symptom | disease)). With symptoms selected, candidates are limited
+    to those that co-occur with them.
+    """
+    pos = index["pos"]
+    matched = []
+    unknown = []
+    for s in selected:
+        key = str(s).lower().strip()
+        i = pos.get(key, pos.get(key.replace(" ", "_")))
+        if i is None:
+            unknown.append(s)
+        elif i not in matched:
+            matched.append(i)
+
+    cond = index["cond_dense"]  # diseases x symptoms
+    post = index["prior"].copy()
+    if matched:
+        post *= np.prod(cond[:, matched] * (1 - eps) + eps, axis=1)
+    post /= post.sum()
+
+    if matched:
+        cooc = index["cooc"][matched].sum(axis=0).A1
+        candidates = np.flatnonzero(cooc > 0)
+    else:
+        cooc = np.zeros(len(index["symptoms"]))
+        candidates = np.arange(len(index["symptoms"]))
+    candidates = np.setdiff1d(candidates, matched)
+
+    if len(candidates) == 0:
+        return {"selected": [index["symptoms"][i] for i in matched], "unknown": unknown, "related": []}
+
+    # P(s | A) and posteriors after observing s present / absent, per candidate
+    P = cond[:, candidates]
+    p_yes = post @ P
+    post_yes = post[:, None] * P
+    post_no = post[:, None] * (1 - P)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        post_yes /= post_yes.sum(axis=0, keepdims=True)
+        post_no /= post_no.sum(axis=0, keepdims=True)
+    post_yes = np.nan_to_num(post_yes)
+    post_no = np.nan_to_num(post_no)
+
+    gain = _entropy(post) - (p_yes * _entropy(post_yes) + (1 - p_yes) * _entropy(post_no))
+
+    k = min(limit, len(candidates))
+    best = np.argpartition(-gain, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+    best = best[np.argsort(-gain[best], kind="stable")]
+
+    return {
+        "selected": [index["symptoms"][i] for i in matched],
+        "unknown": unknown,
+        "related": [
+            {
+                "symptom": index["symptoms"][candidates[j]],
+                "gain": float(gain[j]),
+                "probability": float(p_yes[j]),
+                "cooccurrence": float(cooc[candidates[j]]),
+            }
+            for j in best
+        ],
+    }
@@ -1,3 +1,622 @@
-from django.test import TestCase
+import os
+import tempfile
+import threading
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from . import dataset, warmup
+from .evaluation import cached_evaluate
+from .export import QuantizedLinear, cap_trees, export_model, reduce_model, topk_agreement
+from .inference import top_k
+from .knn import HammingKNNClassifier
+from .registry import check_version, load_version
+from .training import augment, compact, cross_val_weighted
+
+
+def _hamming(Q, X):
+    return (Q[:, None, :] != X[None, :, :]).sum(axis=2)
+
+
+# -------------------------------------------------------------------
+# HammingKNNClassifier
+# -------------------------------------------------------------------
+class HammingKNNTests(SimpleTestCase):
+    A = [1, 1, 0, 0]
+    B = [0, 0, 1, 1]
+    C = [1, 0, 0, 0]
+
+    def setUp(self):
+        self.X = np.array([self.A, self.B, self.A, self.C, self.A, self.B])
+        self.y = np.array(["flu", "cold", "flu", "cold", "flu", "cold"])
+
+    def test_dedupe_collapses_rows_into_weights(self):
+        clf = HammingKNNClassifier(n_neighbors=5).fit(self.X, self.y)
+        self.assertEqual(len(clf.y_), 3)
+        self.assertEqual(sorted(clf.weights_), [1, 2, 3])
+
+    def test_dedupe_keeps_first_occurrence_order(self):
+        clf = HammingKNNClassifier(n_neighbors=5).fit(self.X, self.y)
+        np.testing.assert_array_equal(clf.classes_[clf.y_], ["flu", "cold", "cold"])
+        np.testing.assert_array_equal(clf.weights_, [3, 2, 1])
+
+    def test_weighted_rows_fill_k_like_repeated_rows(self):
+        q = np.array([self.A, self.B, self.C])
+        deduped = HammingKNNClassifier(n_neighbors=5).fit(self.X, self.y).predict_proba(q)
+        repeated = HammingKNNClassifier(n_neighbors=5, dedupe=False).fit(self.X, self.y).predict_proba(q)
+        np.testing.assert_allclose(deduped, repeated)
+        # A x3 at distance 0, C at 1, one of B x2 at 4 -> flu 3/5
+        np.testing.assert_allclose(deduped[0], [2 / 5, 3 / 5])
+
+    def test_row_weight_is_capped_at_k(self):
+        clf = HammingKNNClassifier(n_neighbors=2).fit(self.X, self.y)
+        np.testing.assert_allclose(clf.predict_proba([self.A]), [[0.0, 1.0]])
+
+    def test_sample_weight_counts_as_multiplicity(self):
+        X = np.array([self.A, self.B, self.C])
+        y = np.array(["flu", "cold", "cold"])
+        weighted = HammingKNNClassifier(n_neighbors=5).fit(X, y, sample_weight=[3, 2, 1])
+        repeated = HammingKNNClassifier(n_neighbors=5).fit(self.X, self.y)
+        q = np.array([self.A, self.B, self.C, [0, 1, 1, 0]])
+        np.testing.assert_allclose(weighted.predict_proba(q), repeated.predict_proba(q))
+
+    def test_matches_sklearn_brute_force_including_ties(self):
+        rng = np.random.default_rng(0)
+        X = (rng.random((300, 40)) < 0.2).astype(np.uint8)
+        y = rng.integers(0, 6, 300)
+        q = (rng.random((200, 40)) < 0.2).astype(np.uint8)
+
+        d = np.sort(_hamming(q, X), axis=1)
+        self.assertTrue((d[:, 4] == d[:, 5]).any(), "fixture should contain ties at the k-th distance")
+
+        ref = KNeighborsClassifier(n_neighbors=5, algorithm="brute").fit(X, y)
+        for dedupe in (False, True):  # no duplicate rows here, so dedupe must not change the ranking
+            ours = HammingKNNClassifier(n_neighbors=5, dedupe=dedupe).fit(X, y)
+            np.testing.assert_allclose(ours.predict_proba(q), ref.predict_proba(q))
+            np.testing.assert_array_equal(ours.predict(q), ref.predict(q))
+
+    def test_dedupe_matches_sklearn_unless_kth_distance_is_tied(self):
+        # heavy duplication: 400 rows drawn from 40 distinct ones
+        rng = np.random.default_rng(3)
+        base = (rng.random((40, 12)) < 0.3).astype(np.uint8)
+        labels = rng.integers(0, 4, 40)
+        idx = rng.integers(0, 40, 400)
+        X, y = base[idx], labels[idx]
+        q = (rng.random((300, 12)) < 0.3).astype(np.uint8)
+
+        ref = KNeighborsClassifier(n_neighbors=5, algorithm="brute").fit(X, y).predict_proba(q)
+        ours = HammingKNNClassifier(n_neighbors=5).fit(X, y).predict_proba(q)
+
+        d = np.sort(_hamming(q, X), axis=1)
+        untied = d[:, 4] != d[:, 5]
+        self.assertTrue(untied.any() and not untied.all())
+        np.testing.assert_allclose(ours[untied], ref[untied])
+
+    def test_jaccard_ranks_by_overlap(self):
+        X = np.array([[1, 1, 1, 1, 1, 1, 1, 0], [1, 1, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 1, 1]])
+        q = [[1, 1, 1, 1, 0, 0, 0, 0]]
+        # "a": 3 bits off, jaccard 3/7; "b": 2 bits off, jaccard 1/2
+        jaccard = HammingKNNClassifier(n_neighbors=1, metric="jaccard").fit(X, ["a", "b", "c"])
+        hamming = HammingKNNClassifier(n_neighbors=1).fit(X, ["a", "b", "c"])
+        self.assertEqual(jaccard.predict(q)[0], "a")
+        self.assertEqual(hamming.predict(q)[0], "b")
+
+    def test_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            HammingKNNClassifier(metric="cosine").fit(self.X, self.y)
+
+    def test_from_sklearn(self):
+        knn = KNeighborsClassifier(n_neighbors=3).fit(self.X, self.y)
+        given = HammingKNNClassifier.from_sklearn(knn, self.X, self.y)
+        read_back = HammingKNNClassifier.from_sklearn(knn)
+        self.assertEqual(given.n_neighbors, 3)
+        np.testing.assert_array_equal(given.packed_, read_back.packed_)
+        np.testing.assert_array_equal(given.classes_[given.y_], read_back.classes_[read_back.y_])
+
+    def test_from_sklearn_needs_training_data(self):
+        with self.assertRaises(ValueError):
+            HammingKNNClassifier.from_sklearn(KNeighborsClassifier(n_neighbors=3))
+
+
+# -------------------------------------------------------------------
+# top_k
+# -------------------------------------------------------------------
+class TopKTests(SimpleTestCase):
+    probs = np.array([
+        [0.1, 0.5, 0.0, 0.4],
+        [0.7, 0.0, 0.2, 0.1],
+    ])
+
+    def test_ranks_descending(self):
+        idx, vals, mask = top_k(self.probs, 2)
+        np.testing.assert_array_equal(idx, [[1, 3], [0, 2]])
+        np.testing.assert_allclose(vals, [[0.5, 0.4], [0.7, 0.2]])
+        self.assertTrue(mask.all())
+
+    def test_k_at_or_above_class_count_returns_every_class(self):
+        for k in (4, 10):
+            idx, vals, mask = top_k(self.probs, k)
+            self.assertEqual(idx.shape, (2, 4))
+            np.testing.assert_array_equal(idx, [[1, 3, 0, 2], [0, 2, 3, 1]])
+            self.assertTrue((np.diff(vals, axis=1) <= 0).all())
+
+    def test_k_zero_returns_empty_rows(self):
+        for k in (0, -3):
+            idx, vals, mask = top_k(self.probs, k)
+            self.assertEqual(idx.shape, (2, 0))
+            self.assertEqual(vals.shape, (2, 0))
+            self.assertEqual(mask.dtype, bool)
+            self.assertEqual(idx.dtype, np.intp)
+
+    def test_min_prob_masks_low_probabilities(self):
+        idx, vals, mask = top_k(self.probs, 3, min_prob=0.2)
+        np.testing.assert_array_equal(mask, [[True, True, False], [True, True, False]])
+        # masked entries are still ranked, callers drop them
+        np.testing.assert_array_equal(idx[:, 2], [0, 3])
+
+    def test_single_row(self):
+        idx, vals, mask = top_k([0.2, 0.8], 1)
+        np.testing.assert_array_equal(idx, [[1]])
+
+
+# -------------------------------------------------------------------
+# compact
+# -------------------------------------------------------------------
+class CompactTests(SimpleTestCase):
+    def setUp(self):
+        self.X = pd.DataFrame({"fever": [1, 0, 1, 1, 1], "cough": [1, 1, 1, 1, 0]})
+        self.y = ["flu", "cold", "flu", "cold", "flu"]
+
+    def test_collapses_identical_row_label_pairs(self):
+        X_u, y_u, w_u, report = compact(self.X, self.y)
+        self.assertEqual(X_u.values.tolist(), [[1, 1], [0, 1], [1, 1], [1, 0]])
+        self.assertEqual(list(y_u), ["flu", "cold", "cold", "flu"])
+        np.testing.assert_array_equal(w_u, [2, 1, 1, 1])
+        self.assertEqual(report, {"rows": 5, "unique_rows": 4, "compression_ratio": 1.25})
+
+    def test_sums_given_weights(self):
+        _, _, w_u, _ = compact(self.X, self.y, weights=[0.5, 1, 2, 1, 3])
+        np.testing.assert_allclose(w_u, [2.5, 1, 1, 3])
+        self.assertAlmostEqual(w_u.sum(), 7.5)
+
+    def test_ignores_frame_index(self):
+        X = self.X.set_index(pd.Index([10, 20, 30, 40, 50]))
+        _, _, w_u, _ = compact(X, self.y)
+        np.testing.assert_array_equal(w_u, [2, 1, 1, 1])
+
+    def test_groups_by_value_across_dtypes(self):
+        X = pd.DataFrame({
+            "fever": [1.0, 1.0, 0.5, 1.0],
+            "stage": ["a", "a", None, "b"],
+        })
+        y = pd.Categorical(["flu", "flu", "flu", "flu"])
+        X_u, y_u, w_u, report = compact(X, y)
+        self.assertEqual(report["unique_rows"], 3)
+        np.testing.assert_array_equal(w_u, [2, 1, 1])
+        self.assertTrue(pd.isna(X_u.loc[1, "stage"]))
+
+    def test_augment_keeps_weight_and_source_rows(self):
+        X_u, y_u, w_u, _ = compact(self.X, self.y)
+        X_a, y_a, w_a, groups = augment(X_u, y_u, w_u, max_copies=2)
+        self.assertAlmostEqual(w_a.sum(), w_u.sum())
+        np.testing.assert_array_equal(groups, [0, 0, 1, 2, 3])
+        np.testing.assert_array_equal(y_a, np.asarray(y_u)[groups])
+
+
+class _FoldRecorder:
+    """Estimator stub that records which rows each fold trained / tested on."""
+
+    folds = []
+
+    def fit(self, X, y, sample_weight=None):
+        self.train = set(X.index)
+        return self
+
+    def predict(self, X):
+        self.folds.append((self.train, set(X.index)))
+        return np.zeros(len(X), dtype=int)
+
+
+class CrossValTests(SimpleTestCase):
+    def test_groups_never_span_train_and_test(self):
+        rng = np.random.default_rng(0)
+        X_u = pd.DataFrame((rng.random((40, 6)) < 0.5).astype(int))
+        y_u = np.repeat([0, 1], 20)
+        X_a, y_a, w_a, groups = augment(X_u, y_u, np.full(40, 3.0))
+
+        _FoldRecorder.folds = []
+        scores = cross_val_weighted(_FoldRecorder, X_a, y_a, w_a, cv=4, groups=groups)
+        self.assertEqual(len(scores), 4)
+        for train, test in _FoldRecorder.folds:
+            self.assertFalse(set(groups[list(train)]) & set(groups[list(test)]))
+
+
+# -------------------------------------------------------------------
+# /predict/ input validation
+# -------------------------------------------------------------------
+class PredictValidationTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def post(self, body):
+        return self.client.post("/api/disease/predict/", body, format="json")
+
+    def test_rejects_bad_shapes(self):
+        for body in ({}, {"symptoms": "fever"}, {"batch": []}, {"batch": ["fever"]}, {"batch": {"a": 1}}):
+            self.assertEqual(self.post(body).status_code, 400, body)
+
+    def test_caps_batch_size(self):
+        with self.settings(PREDICT_MAX_BATCH=2):
+            self.assertEqual(self.post({"batch": [[], [], []]}).status_code, 400)
+
+    def test_rejects_non_numeric_and_non_finite_min_prob(self):
+        for value in ("abc", "nan", "inf", "-inf"):
+            response = self.post({"symptoms": [], "min_prob": value})
+            self.assertEqual(response.status_code, 400, value)
+
+
+# -------------------------------------------------------------------
+# Reduced model export
+# -------------------------------------------------------------------
+def _symptom_data(n=400, n_features=30, n_classes=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = (rng.random((n, n_features)) < 0.3).astype(float)
+    W = rng.normal(size=(n_features, n_classes))
+    y = (X @ W + rng.normal(0, 0.5, (n, n_classes))).argmax(axis=1)
+    return X, y
+
+
+def _proba_at_depth(est, X, depth):
+    """Class distribution of the node each sample reaches at `depth` (or its leaf)."""
+    paths = est.decision_path(X).tolil().rows
+    nodes = [path[min(depth, len(path) - 1)] for path in paths]
+    values = est.tree_.value[nodes, 0, :]
+    return values / values.sum(axis=1, keepdims=True)
+
+
+class ExportTests(SimpleTestCase):
+    def setUp(self):
+        self.X, self.y = _symptom_data()
+
+    def test_linear_float32_matches_logistic_regression(self):
+        lr = LogisticRegression(max_iter=2000).fit(self.X, self.y)
+        q = reduce_model(lr, mode="float32")
+        self.assertIsInstance(q, QuantizedLinear)
+        np.testing.assert_allclose(q.predict_proba(self.X), lr.predict_proba(self.X), atol=1e-5)
+        np.testing.assert_array_equal(q.predict(self.X), lr.predict(self.X))
+
+    def test_linear_binary(self):
+        y = (self.X[:, 0] + self.X[:, 1] > 1).astype(int)
+        lr = LogisticRegression().fit(self.X, y)
+        q = QuantizedLinear.from_model(lr)
+        np.testing.assert_allclose(q.predict_proba(self.X), lr.predict_proba(self.X), atol=1e-5)
+
+    def test_linear_int8_stays_close(self):
+        lr = LogisticRegression(max_iter=2000).fit(self.X, self.y)
+        q = reduce_model(lr, mode="int8")
+        self.assertEqual(q.coef_q.dtype, np.int8)
+        ref, probs = lr.predict_proba(self.X), q.predict_proba(self.X)
+        np.testing.assert_allclose(probs.sum(axis=1), 1.0, rtol=1e-5)
+        self.assertLess(np.abs(probs - ref).max(), 0.05)
+        self.assertGreaterEqual(topk_agreement(ref, probs)["top1"], 0.99)
+
+    def test_unknown_mode(self):
+        lr = LogisticRegression(max_iter=2000).fit(self.X, self.y)
+        with self.assertRaises(ValueError):
+            reduce_model(lr, mode="int4")
+
+    def test_tree_at_full_depth_is_unchanged(self):
+        dt = DecisionTreeClassifier(random_state=0).fit(self.X, self.y)
+        capped = cap_trees(dt, max_depth=dt.get_depth())
+        self.assertEqual(capped.tree_.node_count, dt.tree_.node_count)
+        np.testing.assert_array_equal(capped.predict_proba(self.X), dt.predict_proba(self.X))
+
+    def test_pruned_tree_predicts_the_cut_node_distribution(self):
+        dt = DecisionTreeClassifier(random_state=0).fit(self.X, self.y)
+        nodes = dt.tree_.node_count
+        for depth in (1, 3, 5):
+            capped = reduce_model(dt, max_depth=depth)
+            self.assertEqual(capped.get_depth(), depth)
+            self.assertLess(capped.tree_.node_count, nodes)
+            np.testing.assert_allclose(capped.predict_proba(self.X), _proba_at_depth(dt, self.X, depth))
+        # the served model is not modified
+        self.assertEqual(dt.tree_.node_count, nodes)
+
+    def test_forest_keeps_first_trees_and_prunes_each(self):
+        rf = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, self.y)
+        first = cap_trees(rf, n_estimators=3)
+        self.assertEqual(len(first.estimators_), 3)
+        self.assertEqual(len(rf.estimators_), 10)
+        expected = np.mean([e.predict_proba(self.X) for e in rf.estimators_[:3]], axis=0)
+        np.testing.assert_allclose(first.predict_proba(self.X), expected)
+
+        capped = reduce_model(rf, max_depth=3)
+        expected = np.mean([_proba_at_depth(e, self.X, 3) for e in rf.estimators_], axis=0)
+        np.testing.assert_allclose(capped.predict_proba(self.X), expected)
+
+    def test_knn_export_matches_away_from_ties(self):
+        knn = KNeighborsClassifier(n_neighbors=5).fit(self.X, self.y)
+        reduced = reduce_model(knn)
+        self.assertIsInstance(reduced, HammingKNNClassifier)
+        # sklearn orders float neighbours at equal distance its own way
+        d = np.sort(_hamming(self.X, self.X), axis=1)
+        untied = d[:, 4] != d[:, 5]
+        self.assertTrue(untied.sum() > 50)
+        np.testing.assert_allclose(reduced.predict_proba(self.X)[untied], knn.predict_proba(self.X)[untied])
+
+    def test_topk_agreement_ignores_zero_probability_classes(self):
+        ref = np.array([[0.9, 0.1, 0.0, 0.0]])
+        new = np.array([[0.8, 0.2, 0.0, 0.0]])
+        self.assertEqual(topk_agreement(ref, new, k=4), {"top1": 1.0, "topk": 1.0, "k": 4})
+        swapped = np.array([[0.1, 0.9, 0.0, 0.0]])
+        self.assertEqual(topk_agreement(ref, swapped, k=1), {"top1": 0.0, "topk": 0.0, "k": 1})
+
+    def test_report_gates_on_both_thresholds(self):
+        dt = DecisionTreeClassifier(random_state=0).fit(self.X, self.y)
+        _, report = export_model(dt, self.X, max_depth=dt.get_depth())
+        self.assertTrue(report["passed"])
+        _, report = export_model(dt, self.X, max_depth=1)
+        self.assertFalse(report["passed"])
+        _, report = export_model(dt, self.X, min_topk_agreement=1.01, max_depth=dt.get_depth())
+        self.assertFalse(report["passed"])
+
+
+class ExportViewTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_rejects_k_below_one(self):
+        for k in (0, -1, "x"):
+            self.assertEqual(self.client.post("/api/disease/export/", {"k": k}, format="json").status_code, 400)
+
+    def test_publish_needs_admin(self):
+        body = {"min_agreement": 0, "min_topk_agreement": 0, "publish": True}
+        response = self.client.post("/api/disease/export/", body, format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+# -------------------------------------------------------------------
+# Offline evaluation
+# -------------------------------------------------------------------
+class EvaluateVersionTests(SimpleTestCase):
+    BAD_VERSIONS = ("../model", "..", "/etc/passwd", "0123456789AB", "0123456789a", "0123456789abc", "latest")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_check_version(self):
+        for version in (None, "", "active", "0123456789ab"):
+            self.assertEqual(check_version(version), version)
+        for version in self.BAD_VERSIONS:
+            with self.assertRaises(ValueError, msg=version):
+                check_version(version)
+
+    def test_paths_never_reach_the_store(self):
+        for version in self.BAD_VERSIONS:
+            with self.assertRaises(ValueError):
+                load_version(version)
+            with self.assertRaises(ValueError):
+                cached_evaluate(version, dataset=None)
+
+    def test_view_rejects_bad_versions(self):
+        for params in ({"version": "../../x"}, {"compare": "../../x"}, {"version": "active", "compare": "abc"}):
+            self.assertEqual(self.client.get("/api/disease/evaluate/", params).status_code, 400, params)
+
+    def test_view_rejects_k_below_one(self):
+        for k in (0, -2, "x"):
+            self.assertEqual(self.client.get("/api/disease/evaluate/", {"k": k}).status_code, 400)
+
+
+# -------------------------------------------------------------------
+# Training.csv loader / .npz cache
+# -------------------------------------------------------------------
+CSV = "fever,cough,emergency,tests,prognosis\n1,0,0,CBC,flu\n0,1,1,,cold\n1,1,0,X-ray,flu\n"
+
+
+class TrainingFrameTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        for patcher in (mock.patch.object(dataset, "DATASET_CACHE_DIR", os.path.join(self.dir, "cache")),
+                        mock.patch.dict(dataset._memo, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _csv(self, text=CSV, name="Training.csv", subdir=""):
+        os.makedirs(os.path.join(self.dir, subdir), exist_ok=True)
+        path = os.path.join(self.dir, subdir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def _load(self, path):
+        dataset._memo.clear()  # as in a fresh process: only the .npz cache is left
+        with mock.patch.object(dataset, "_parse_csv", wraps=dataset._parse_csv) as parse:
+            df = dataset.load_training_frame(path)
+        return df, parse.called
+
+    def test_round_trip_through_cache(self):
+        path = self._csv()
+        parsed, was_parsed = self._load(path)
+        self.assertTrue(was_parsed)
+        self.assertEqual(parsed[["fever", "cough", "emergency"]].dtypes.unique().tolist(), [np.uint8])
+        self.assertEqual(parsed["prognosis"].dtype, "category")
+
+        cached, was_parsed = self._load(path)
+        self.assertFalse(was_parsed)
+        pd.testing.assert_frame_equal(cached, parsed)
+        self.assertTrue(pd.isna(cached.loc[1, "tests"]))
+
+    def test_cache_follows_mtime_and_size(self):
+        path = self._csv()
+        self._load(path)
+
+        self._csv(CSV.replace("1,0,0,CBC", "1,0,1,CBC"))  # same size, new mtime
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        df, was_parsed = self._load(path)
+        self.assertTrue(was_parsed)
+        self.assertEqual(df.loc[0, "emergency"], 1)
+
+        self._csv(CSV + "0,0,0,,none\n")
+        df, was_parsed = self._load(path)
+        self.assertTrue(was_parsed)
+        self.assertEqual(len(df), 4)
+
+    def test_same_file_name_in_other_directories(self):
+        a = self._csv(subdir="a")
+        b = self._csv(CSV.replace("flu", "measles"), subdir="b")
+        self.assertEqual(set(self._load(a)[0]["prognosis"]), {"flu", "cold"})
+        self.assertEqual(set(self._load(b)[0]["prognosis"]), {"measles", "cold"})
+        self.assertEqual(set(self._load(a)[0]["prognosis"]), {"flu", "cold"})
+        self.assertEqual(len(os.listdir(os.path.join(self.dir, "cache"))), 2)
+
+    def test_rejects_values_other_than_0_1(self):
+        for bad in ("2", "300", "-1", "0.5", ""):
+            path = self._csv(CSV.replace("0,1,1,,cold", f"0,{bad},1,,cold"))
+            with self.assertRaisesRegex(ValueError, "'cough' must hold 0/1.*line 3"):
+                self._load(path)
+
+    def test_yes_no_cells_are_left_for_build_features(self):
+        path = self._csv(CSV.replace("1,0,0,CBC", "yes,0,0,CBC").replace("0,1,1,", "no,1,1,"))
+        with self.assertLogs("DiseasePredictor.dataset", "WARNING"):
+            df, _ = self._load(path)
+        self.assertEqual(df["fever"].tolist(), ["yes", "no", "1"])
+        self.assertEqual(df["cough"].dtype, np.uint8)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "cache")))
+
+
+# -------------------------------------------------------------------
+# Startup warm-up / readiness
+# -------------------------------------------------------------------
+class ServingProcessTests(SimpleTestCase):
+    def test_servers_however_launched(self):
+        for argv in (["/venv/bin/gunicorn", "Backend.wsgi"],
+                     ["/venv/lib/python3.11/site-packages/gunicorn/__main__.py", "Backend.wsgi"],
+                     ["/venv/lib/python3.11/site-packages/uvicorn/__main__.py", "Backend.asgi:application"],
+                     ["uwsgi", "--module", "Backend.wsgi"],
+                     []):
+            self.assertTrue(warmup._serving_process(argv), argv)
+
+    def test_management_commands(self):
+        for argv in (["manage.py", "migrate"], ["./manage.py"], ["/venv/bin/django-admin", "test"],
+                     ["/venv/lib/python3.11/site-packages/django/__main__.py", "shell"]):
+            self.assertFalse(warmup._serving_process(argv), argv)
+
+    def test_runserver_warms_only_the_serving_child(self):
+        with mock.patch.dict(os.environ, {"RUN_MAIN": ""}):
+            self.assertFalse(warmup._serving_process(["manage.py", "runserver"]))
+            self.assertTrue(warmup._serving_process(["manage.py", "runserver", "--noreload"]))
+        with mock.patch.dict(os.environ, {"RUN_MAIN": "true"}):
+            self.assertTrue(warmup._serving_process(["manage.py", "runserver"]))
+
+
+class ReadinessTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        patcher = mock.patch.dict(warmup._state, {"status": "pending", "mode": None, "steps": {}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _probe(self):
+        response = self.client.get("/api/disease/ready/")
+        return response.status_code, response.json()["status"]
+
+    def _start(self, mode, serving):
+        with mock.patch.object(warmup, "_serving_process", return_value=serving), \
+                mock.patch.object(warmup, "_start_background") as background:
+            warmup.start(mode)
+        return background
+
+    def test_states(self):
+        for status, code in (("pending", 503), ("warming", 503), ("ready", 200), ("disabled", 200)):
+            warmup._set(status=status)
+            self.assertEqual(self._probe(), (code, status))
+
+    def test_off_is_ready_at_once(self):
+        self._start("off", serving=True)
+        self.assertEqual(self._probe(), (200, "disabled"))
+
+    def test_background_reports_not_ready_until_warm(self):
+        background = self._start("background", serving=True)
+        background.assert_called_once()
+        self.assertEqual(self._probe(), (503, "warming"))
+
+    def test_skipped_warm_up_is_not_ready_and_the_probe_starts_it(self):
+        background = self._start("background", serving=False)
+        background.assert_not_called()
+        self.assertFalse(warmup.status()["ready"])
+
+        release, done = threading.Event(), threading.Event()
+
+        def fake_warm_up():
+            release.wait(5)
+            warmup._set(status="ready")
+            done.set()
+
+        with mock.patch.object(warmup, "warm_up", fake_warm_up), \
+                mock.patch.object(warmup, "_register_fork_hook"):
+            self.assertEqual(self._probe(), (503, "warming"))
+            self.assertEqual(self._probe(), (503, "warming"))  # started once, still running
+            release.set()
+            self.assertTrue(done.wait(5))
+        self.assertEqual(self._probe(), (200, "ready"))
+
+
+class ForkHookTests(SimpleTestCase):
+    def setUp(self):
+        # the hook swaps module-level locks; put the originals back afterwards
+        saved = [(warmup, "_state_lock", warmup._state_lock)]
+        for module_name, names in warmup._LOCKS.items():
+            module = __import__(module_name, fromlist=["_"])
+            saved += [(module, name, getattr(module, name)) for name in names]
+        self.addCleanup(lambda: [setattr(m, n, v) for m, n, v in saved])
+        patcher = mock.patch.dict(warmup._state, {"status": "ready"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_child_gets_fresh_locks(self):
+        dataset._memo_lock.acquire()  # as if the warm-up thread held it at fork time
+        self.addCleanup(dataset._memo_lock.release)
+        with mock.patch.object(warmup, "warm_up") as warm_up:
+            warmup._after_fork_in_child()
+        self.assertTrue(dataset._memo_lock.acquire(blocking=False))
+        warm_up.assert_not_called()
+
+    def test_child_reruns_an_unfinished_warm_up(self):
+        warmup._set(status="warming")
+        done = threading.Event()
+        with mock.patch.object(warmup, "warm_up", done.set):
+            warmup._after_fork_in_child()
+            self.assertTrue(done.wait(5))
+
+    @skipUnless(hasattr(os, "fork") and hasattr(os, "register_at_fork"), "needs os.fork")
+    def test_forked_child_is_not_blocked_by_a_lock_held_in_the_parent(self):
+        warmup._register_fork_hook()
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with dataset._memo_lock:
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        self.assertTrue(held.wait(5))
+        try:
+            pid = os.fork()
+            if pid == 0:
+                os._exit(0 if dataset._memo_lock.acquire(timeout=2) else 1)
+        finally:
+            release.set()
+            holder.join(5)
+        _, code = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(code), 0)
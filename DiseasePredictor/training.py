@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedGroupKFold, StratifiedKFold
+from sklearn.utils.validation import has_fit_parameter
+
+
+# -------------------------------------------------------------------
+# Feature preparation
+# -------------------------------------------------------------------
+# per-disease metadata columns in Training.csv (not symptoms)
+METADATA_COLUMNS = ("tests", "medicines", "emergency")
+
+
+def build_features(df):
+    """Training.csv frame -> (numeric feature frame, prognosis series)."""
+    feature_cols = [c for c in df.columns if c != "prognosis"]
+    X = df[feature_cols].copy()
+    y = df["prognosis"]
+
+    # convert text columns that hold only numbers (typed loads skip this)
+    for col in X.select_dtypes(exclude="number").columns:
+        converted = pd.to_numeric(X[col], errors="coerce")
+        if converted.notna().sum() == X[col].notna().sum():
+            X[col] = converted
+
+    X = X.replace({"yes": 1, "no": 0, True: 1, False: 0})
+
+    # encode strings
+    non_numeric = X.select_dtypes(include=["object"]).columns.tolist()
+    if non_numeric:
+        X = pd.get_dummies(X, columns=non_numeric)
+
+    return X, y
+
+
+def add_noise(X):
+    """Unweighted augmentation: flip ~3% of binary cells of every row."""
+    X_noisy = X.copy().astype(float).to_numpy()
+    n_samples, n_features = X_noisy.shape
+
+    rng = np.random.default_rng(42)
+    noise_fraction = 0.03
+    n_noisy = int(noise_fraction * n_samples * n_features)
+
+    rows = rng.integers(0, n_samples, size=n_noisy)
+    cols = rng.integers(0, n_features, size=n_noisy)
+
+    for r, c in zip(rows, cols):
+        v = X_noisy[r, c]
+        if v in (0, 1):
+            X_noisy[r, c] = 1 - v
+        else:
+            X_noisy[r, c] = v + rng.normal(0, 0.2)
+
+    return pd.DataFrame(X_noisy, columns=X.columns)
+
+
+# -------------------------------------------------------------------
+# Compaction
+# -------------------------------------------------------------------
+def compact(X, y, weights=None):
+    """
+    Collapse identical (feature row, label) pairs into one row each.
+
+    Returns (X_unique, y_unique, weights, report) where weights holds the
+    summed weight (the multiplicity, when weights is None) of every unique
+    row and report gives the row counts and compression ratio.
+    """
+    y = pd.Series(np.asarray(y), name="__label__")
+    w = np.ones(len(y)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    keyed = X.reset_index(drop=True).copy()
+    keyed[y.name] = y.to_numpy()
+    # group by the values themselves (per-column codes), not a row hash, so
+    # two different rows can never be merged; groups are numbered in order
+    # of first occurrence
+    keys = np.column_stack([pd.factorize(keyed[c])[0] for c in keyed.columns])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    codes = rank[inverse.ravel()]
+    first = first[order]
+
+    X_u = X.iloc[first].reset_index(drop=True)
+    y_u = y.to_numpy()[first]
+    w_u = np.bincount(codes, weights=w)
+
+    report = {
+        "rows": int(len(y)),
+        "unique_rows": int(len(first)),
+        "compression_ratio": float(len(y) / max(len(first), 1)),
+    }
+    return X_u, y_u, w_u, report
+
+
+# -------------------------------------------------------------------
+# Weighted augmentation
+# -------------------------------------------------------------------
+def augment(X, y, weights, noise_fraction=0.03, max_copies=4, seed=42):
+    """
+    Noisy copies of weighted rows. Every row gets min(weight, max_copies)
+    copies that share its weight equally, so each row's total weight is kept.
+    Binary cells flip with probability noise_fraction; other values get
+    gaussian jitter.
+
+    Returns (X_aug, y_aug, weights, groups); groups[i] is the index of the
+    row copy i was made from, for group-aware cross-validation.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    copies = np.clip(np.ceil(weights).astype(int), 1, max_copies)
+    idx = np.repeat(np.arange(len(weights)), copies)
+    w = np.repeat(weights / copies, copies)
+
+    X_aug = X.to_numpy(dtype=float)[idx]
+    hit = rng.random(X_aug.shape) < noise_fraction
+    binary = (X_aug == 0) | (X_aug == 1)
+
+    flip = hit & binary
+    X_aug[flip] = 1 - X_aug[flip]
+    jitter = hit & ~binary
+    X_aug[jitter] += rng.normal(0, 0.2, size=int(jitter.sum()))
+
+    return pd.DataFrame(X_aug, columns=X.columns), np.asarray(y)[idx], w, idx
+
+
+# -------------------------------------------------------------------
+# Weighted fitting / CV
+# -------------------------------------------------------------------
+def fit_weighted(model, X, y, weights):
+    """
+    Fit with sample_weight, or, for estimators without it (sklearn KNN),
+    on rows repeated by their rounded weight.
+    """
+    if has_fit_parameter(model, "sample_weight"):
+        return model.fit(X, y, sample_weight=weights)
+
+    reps = np.maximum(np.rint(weights), 1).astype(int)
+    idx = np.repeat(np.arange(len(y)), reps)
+    return model.fit(X.iloc[idx], np.asarray(y)[idx])
+
+
+def cross_val_weighted(make_model, X, y, weights, cv=5, groups=None):
+    """
+    Stratified k-fold accuracy with weights used in fitting and scoring.
+    With groups (e.g. augment()'s source row ids) all rows of a group land
+    in the same fold, so noisy copies of a test row are never trained on.
+    """
+    y = np.asarray(y)
+    if groups is None:
+        splits = StratifiedKFold(n_splits=cv).split(X, y)
+    else:
+        splits = StratifiedGroupKFold(n_splits=cv).split(X, y, groups)
+
+    scores = []
+    for tr, te in splits:
+        model = fit_weighted(make_model(), X.iloc[tr], y[tr], weights[tr])
+        scores.append(accuracy_score(y[te], model.predict(X.iloc[te]), sample_weight=weights[te]))
+    return np.array(scores)
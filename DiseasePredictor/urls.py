@@ -7,6 +7,11 @@ urlpatterns = [
     path("train/", views.train, name="train"),
     path("predict/", views.predict, name="predict"),
     path("symptoms/", views.symptom_list, name="symptom-list"),
+    path("symptoms/related/", views.related_symptoms, name="related-symptoms"),
     path("scores/", views.model_scores, name="model-scores"),
     path("subsymptoms/", views.subsymptoms, name="subsymptoms"),
+    path("export/", views.export, name="export"),
+    path("versions/", views.model_versions, name="model-versions"),
+    path("evaluate/", views.evaluate_model, name="evaluate-model"),
+    path("ready/", views.readiness, name="readiness"),
 ]
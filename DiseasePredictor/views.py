@@ -1,18 +1,15 @@
 import os
-import json
-import pandas as pd
 import numpy as np
 
 from django.conf import settings
 from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 
 from joblib import dump, load as joblib_load
 
 from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import cross_val_score
 
 from sklearn.svm import SVC
 from sklearn.ensemble import RandomForestClassifier
@@ -22,21 +19,35 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 
 from .models import SymptomDisease
-
-
-# -------------------------------------------------------------------
-# Paths
-# -------------------------------------------------------------------
-BASE_DIR = settings.BASE_DIR
-APP_DIR = os.path.join(BASE_DIR, "DiseasePredictor")
-
-TRAIN_CSV_PATH = os.path.join(APP_DIR, "Training.csv")
-MODEL_PATH = os.path.join(APP_DIR, "model.pkl")
-COLS_PATH = os.path.join(APP_DIR, "columns.pkl")
-LE_PATH = os.path.join(APP_DIR, "label_encoder.pkl")
-LAST_SCORES_PATH = os.path.join(APP_DIR, "last_scores.pkl")
-
-SUBSYM_PATH = os.path.join(BASE_DIR, "data", "subsymptoms.json")
+from .history import get_writer, prediction_log_enabled
+from .inference import load_bundle, top_k
+from .export import export_model
+from .dataset import load_subsymptoms, load_training_frame
+from .evaluation import EvalDataset, cached_evaluate, compare, summary
+from .registry import archive_active, check_version, list_versions
+from . import warmup
+from .knn import HammingKNNClassifier
+from .symptom_index import index_from_frame, load_index, related, save_index
+from .training import (
+    METADATA_COLUMNS,
+    add_noise,
+    augment,
+    build_features,
+    compact,
+    cross_val_weighted,
+    fit_weighted,
+)
+from .paths import (
+    TRAIN_CSV_PATH,
+    MODEL_PATH,
+    COLS_PATH,
+    LE_PATH,
+    LAST_SCORES_PATH,
+    MODEL_FULL_PATH,
+    MODEL_REDUCED_PATH,
+    SYMPTOM_INDEX_PATH,
+    SUBSYM_PATH,
+)
 
 
 # -------------------------------------------------------------------
@@ -52,7 +63,12 @@ def api_root(request):
         "predict": base + "predict/",
         "symptoms": base + "symptoms/",
         "scores": base + "scores/",
+        "related_symptoms": base + "symptoms/related/",
         "subsymptoms": base + "subsymptoms/",
+        "export": base + "export/",
+        "versions": base + "versions/",
+        "evaluate": base + "evaluate/",
+        "ready": base + "ready/",
     })
 
 
@@ -67,23 +83,26 @@ def insertpd(request):
         return JsonResponse({"detail": "Training.csv not found."}, status=400)
 
     try:
-        df = pd.read_csv(TRAIN_CSV_PATH)
+        df = load_training_frame()
     except Exception as e:
         return JsonResponse({"detail": f"CSV read error: {str(e)}"}, status=500)
 
     if "prognosis" not in df.columns:
         return JsonResponse({"detail": "CSV must contain prognosis column."}, status=400)
 
+    # one row per unique (symptom vector, prognosis) pair, weighted by its count
+    feature_cols = [c for c in df.columns if c != "prognosis"]
+    unique, labels, weights, report = compact(df[feature_cols], df["prognosis"])
+
     SymptomDisease.objects.all().delete()
 
-    inserted = 0
-    for _, row in df.iterrows():
-        prog = row["prognosis"]
-        raw = {c: row[c] for c in df.columns if c != "prognosis"}
-        SymptomDisease.objects.create(prognosis=prog, raw=raw)
-        inserted += 1
+    objs = [
+        SymptomDisease(prognosis=prog, raw=raw, weight=int(w))
+        for prog, raw, w in zip(labels, unique.to_dict("records"), weights)
+    ]
+    SymptomDisease.objects.bulk_create(objs, batch_size=1000)
 
-    return JsonResponse({"inserted": inserted})
+    return JsonResponse({"inserted": len(objs), **report})
 
 
 # -------------------------------------------------------------------
@@ -97,59 +116,37 @@ def train(request):
         return JsonResponse({"detail": "Training.csv not found."}, status=400)
 
     try:
-        df = pd.read_csv(TRAIN_CSV_PATH)
+        df = load_training_frame()
     except Exception as e:
         return JsonResponse({"detail": str(e)}, status=500)
 
     if "prognosis" not in df.columns:
         return JsonResponse({"detail": "CSV must contain prognosis column."}, status=400)
 
-    feature_cols = [c for c in df.columns if c != "prognosis"]
-    X = df[feature_cols].copy()
-    y = df["prognosis"]
-
-    # convert to numeric
-    for col in X.columns:
-        try:
-            X[col] = pd.to_numeric(X[col])
-        except:
-            pass
-
-    X = X.replace({"yes": 1, "no": 0, True: 1, False: 0})
-
-    # encode strings
-    non_numeric = X.select_dtypes(include=["object"]).columns.tolist()
-    if non_numeric:
-        X = pd.get_dummies(X, columns=non_numeric)
+    X, y = build_features(df)
 
     le = LabelEncoder()
     y_enc = le.fit_transform(y)
 
-    # noise
-    X_noisy = X.copy().astype(float).to_numpy()
-    n_samples, n_features = X_noisy.shape
-
-    rng = np.random.default_rng(42)
-    noise_fraction = 0.03
-    n_noisy = int(noise_fraction * n_samples * n_features)
-
-    rows = rng.integers(0, n_samples, size=n_noisy)
-    cols = rng.integers(0, n_features, size=n_noisy)
-
-    for r, c in zip(rows, cols):
-        v = X_noisy[r, c]
-        if v in (0, 1):
-            X_noisy[r, c] = 1 - v
-        else:
-            X_noisy[r, c] = v + rng.normal(0, 0.2)
-
-    X_noisy = pd.DataFrame(X_noisy, columns=X.columns)
+    compaction = None
+    if getattr(settings, "TRAIN_COMPACT", True):
+        # fit on unique rows + weights instead of every duplicate row
+        X_c, y_c, w_c, compaction = compact(X, y_enc)
+        X_noisy, y_train, weights, groups = augment(
+            X_c, y_c, w_c, max_copies=getattr(settings, "TRAIN_NOISE_COPIES", 4)
+        )
+    else:
+        X_noisy = add_noise(X)
+        y_train = y_enc
+        weights = np.ones(len(y_enc))
+        groups = None
 
     models = {
         "svm_rbf": lambda: SVC(probability=True, kernel="rbf"),
         "random_forest": lambda: RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=-1),
         "naive_bayes": lambda: GaussianNB(),
         "knn": lambda: KNeighborsClassifier(n_neighbors=5),
+        "knn_hamming": lambda: HammingKNNClassifier(n_neighbors=5),
         "logistic_regression": lambda: LogisticRegression(max_iter=1000),
         "decision_tree": lambda: DecisionTreeClassifier(random_state=42),
     }
@@ -159,8 +156,7 @@ def train(request):
     best_score = -1
 
     for name, make_model in models.items():
-        model = make_model()
-        scores = cross_val_score(model, X_noisy, y_enc, cv=5)
+        scores = cross_val_weighted(make_model, X_noisy, y_train, weights, cv=5, groups=groups)
         avg = scores.mean()
         accuracies[name] = float(avg)
 
@@ -168,106 +164,182 @@ def train(request):
             best_score = avg
             best_name = name
 
-    best_model = models[best_name]()
-    best_model.fit(X_noisy, y_enc)
+    best_model = fit_weighted(models[best_name](), X_noisy, y_train, weights)
+
+    # keep the outgoing model evaluable before it is replaced
+    archive_active()
 
     dump(best_model, MODEL_PATH)
+    if os.path.exists(MODEL_FULL_PATH):
+        os.remove(MODEL_FULL_PATH)
     dump(list(X_noisy.columns), COLS_PATH)
     dump(le, LE_PATH)
-    dump({"best_model": best_name, "accuracies": accuracies}, LAST_SCORES_PATH)
+    dump({"best_model": best_name, "accuracies": accuracies, "compaction": compaction}, LAST_SCORES_PATH)
+    version = archive_active()
+    save_index(index_from_frame(df, exclude=METADATA_COLUMNS), SYMPTOM_INDEX_PATH)
 
     return JsonResponse({
         "status": "trained",
+        "version": version,
         "best_model": best_name,
         "best_accuracy": float(best_score),
         "accuracies": accuracies,
+        "compaction": compaction,
     })
 
 
 # -------------------------------------------------------------------
-# PREDICT WITH TESTS + MEDICINES + EMERGENCY
+# EXPORT REDUCED MODEL
 # -------------------------------------------------------------------
 @api_view(["POST"])
 @permission_classes([AllowAny])
-def predict(request):
-
+def export(request):
+    """
+    Build a reduced-precision copy of the trained model and validate its
+    top-k agreement with the original on Training.csv.
+
+    Body (all optional): mode ("float32" | "int8"), max_depth, n_estimators,
+    k, publish. Trees / forests are pruned in place of a refit. The report
+    passes when top-1 / top-k agreement reach EXPORT_MIN_AGREEMENT /
+    EXPORT_MIN_TOPK_AGREEMENT. publish=true (admin only) then replaces
+    model.pkl with the reduced model; the original is kept as model_full.pkl.
+    """
     body = request.data
-    symptoms = body.get("symptoms", None)
 
-    if symptoms is None:
-        return JsonResponse({"detail": "Provide symptoms list."}, status=400)
+    try:
+        k = int(body.get("k", 5))
+    except (TypeError, ValueError):
+        return JsonResponse({"detail": "k must be an integer."}, status=400)
+    if k < 1:
+        return JsonResponse({"detail": "k must be at least 1."}, status=400)
+
+    publish = bool(body.get("publish"))
+    if publish and not IsAdminUser().has_permission(request, None):
+        return JsonResponse({"detail": "Only admins can publish an export."}, status=403)
 
     if not (os.path.exists(MODEL_PATH) and os.path.exists(COLS_PATH) and os.path.exists(LE_PATH)):
         return JsonResponse({"detail": "Model missing. Train first."}, status=400)
 
-    clf = joblib_load(MODEL_PATH)
-    cols = joblib_load(COLS_PATH)
-    le = joblib_load(LE_PATH)
-
-    # build vector
-    row = {c: 0 for c in cols}
-    sym_set = {str(s).lower().strip() for s in symptoms if s}
-    col_map = {c.lower(): c for c in cols}
-
-    for s in sym_set:
-        if s in col_map:
-            row[col_map[s]] = 1
-        elif s.replace(" ", "_") in col_map:
-            row[col_map[s.replace(" ", "_")]] = 1
+    try:
+        df = load_training_frame()
+    except Exception as e:
+        return JsonResponse({"detail": str(e)}, status=500)
 
-    X_in = pd.DataFrame([row], columns=cols)
+    source_path = MODEL_FULL_PATH if os.path.exists(MODEL_FULL_PATH) else MODEL_PATH
+    clf = joblib_load(source_path)
+    cols = joblib_load(COLS_PATH)
 
-    probs = clf.predict_proba(X_in)[0]
-    top = probs.argsort()[::-1][:5]
+    X, _ = build_features(df)
+    X = X.reindex(columns=cols, fill_value=0).astype(float)
 
-    # ---- load metadata from Training.csv ----
-    meta_map = {}
     try:
-        df = pd.read_csv(TRAIN_CSV_PATH)
-        for _, r in df.iterrows():
-            d = str(r["prognosis"]).strip().lower()
-            meta_map[d] = {
-                "tests": [t.strip() for t in str(r.get("tests","")).split("|") if t.strip()],
-                "medicines": [m.strip() for m in str(r.get("medicines","")).split("|") if m.strip()],
-                "emergency": bool(int(r.get("emergency",0))),
-            }
-    except:
-        pass
+        reduced, report = export_model(
+            clf, X,
+            k=k,
+            min_agreement=getattr(settings, "EXPORT_MIN_AGREEMENT", 0.99),
+            min_topk_agreement=getattr(settings, "EXPORT_MIN_TOPK_AGREEMENT", 0.95),
+            mode=body.get("mode", "float32"),
+            max_depth=body.get("max_depth"),
+            n_estimators=body.get("n_estimators"),
+        )
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+
+    dump(reduced, MODEL_REDUCED_PATH)
+    report["published"] = False
+
+    if publish and report["passed"]:
+        archive_active()
+        if source_path == MODEL_PATH:
+            os.replace(MODEL_PATH, MODEL_FULL_PATH)
+        dump(reduced, MODEL_PATH)
+        report["version"] = archive_active()
+        report["published"] = True
+
+    return JsonResponse(report)
 
-    results = []
+
+# -------------------------------------------------------------------
+# PREDICT WITH TESTS + MEDICINES + EMERGENCY
+# -------------------------------------------------------------------
+def _summarize(ranked):
     agg_tests = set()
     agg_meds = set()
-    emergency_flag = False
     emergency_reasons = []
 
-    for idx in top:
-        disease = le.inverse_transform([idx])[0]
-        prob = float(probs[idx])
+    for r in ranked:
+        if r["emergency"]:
+            emergency_reasons.append(r["disease"])
+        agg_tests.update(r["tests"])
+        agg_meds.update(r["medicines"])
+
+    return {
+        "predictions": ranked,
+        "agg_tests": list(agg_tests),
+        "agg_medicines": list(agg_meds),
+        "emergency": bool(emergency_reasons),
+        "emergency_reasons": emergency_reasons,
+    }
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def predict(request):
+    """
+    Body: {"symptoms": [...]} or {"batch": [[...], [...]]} (at most
+    PREDICT_MAX_BATCH rows), plus optional "top_k" and "min_prob"
+    (defaults: PREDICT_TOP_K / PREDICT_MIN_PROB).
+    Classes outside the returned top-k are summarised as tail_count / tail_prob.
+    """
+    body = request.data
+    symptoms = body.get("symptoms", None)
+    batch = body.get("batch", None)
+
+    if symptoms is None and batch is None:
+        return JsonResponse({"detail": "Provide symptoms list."}, status=400)
 
-        meta = meta_map.get(disease.lower(), {"tests": [], "medicines": [], "emergency": False})
+    if batch is not None:
+        if not isinstance(batch, list) or not batch or not all(isinstance(r, list) for r in batch):
+            return JsonResponse({"detail": "batch must be a non-empty list of symptom lists."}, status=400)
+        max_batch = getattr(settings, "PREDICT_MAX_BATCH", 256)
+        if len(batch) > max_batch:
+            return JsonResponse({"detail": f"batch is limited to {max_batch} rows."}, status=400)
+    elif not isinstance(symptoms, list):
+        return JsonResponse({"detail": "symptoms must be a list."}, status=400)
 
-        if meta["emergency"]:
-            emergency_flag = True
-            emergency_reasons.append(disease)
+    try:
+        k = int(body.get("top_k", getattr(settings, "PREDICT_TOP_K", 5)))
+        min_prob = float(body.get("min_prob", getattr(settings, "PREDICT_MIN_PROB", 0.0)))
+    except (TypeError, ValueError):
+        return JsonResponse({"detail": "top_k and min_prob must be numbers."}, status=400)
+    if not np.isfinite(min_prob):
+        return JsonResponse({"detail": "min_prob must be a finite number."}, status=400)
+    k = max(1, min(k, getattr(settings, "PREDICT_MAX_TOP_K", 50)))
 
-        agg_tests.update(meta["tests"])
-        agg_meds.update(meta["medicines"])
+    if not (os.path.exists(MODEL_PATH) and os.path.exists(COLS_PATH) and os.path.exists(LE_PATH)):
+        return JsonResponse({"detail": "Model missing. Train first."}, status=400)
 
-        results.append({
-            "disease": disease,
-            "prob": prob,
-            "tests": meta["tests"],
-            "medicines": meta["medicines"],
-            "emergency": meta["emergency"],
-        })
+    bundle = load_bundle(MODEL_PATH, COLS_PATH, LE_PATH, TRAIN_CSV_PATH)
 
-    return JsonResponse({
-        "predictions": results,
-        "agg_tests": list(agg_tests),
-        "agg_medicines": list(agg_meds),
-        "emergency": emergency_flag,
-        "emergency_reasons": emergency_reasons,
-    })
+    rows = batch if batch is not None else [symptoms]
+    probs = bundle.predict_proba(rows)
+    idx, vals, mask = top_k(probs, k, min_prob)
+
+    log = get_writer() if prediction_log_enabled() else None
+
+    results = []
+    for r in range(len(rows)):
+        ranked = bundle.classes.rows(idx[r], vals[r], mask[r])
+        if log is not None:
+            log.log(bundle.version, rows[r], ranked)
+        out = _summarize(ranked)
+        out["tail_count"] = int(probs.shape[1] - len(ranked))
+        out["tail_prob"] = max(0.0, 1.0 - sum(p["prob"] for p in ranked))
+        results.append(out)
+
+    if batch is not None:
+        return JsonResponse({"results": results})
+    return JsonResponse(results[0])
 
 
 # -------------------------------------------------------------------
@@ -287,7 +359,7 @@ def symptom_list(request):
 
     if cols is None and os.path.exists(TRAIN_CSV_PATH):
         try:
-            df = pd.read_csv(TRAIN_CSV_PATH)
+            df = load_training_frame()
             cols = [c for c in df.columns if c != "prognosis"]
         except:
             cols = None
@@ -308,6 +380,31 @@ def symptom_list(request):
     return Response([{"id": i+1, "name": c} for i, c in enumerate(cols)])
 
 
+# -------------------------------------------------------------------
+# RELATED SYMPTOMS
+# -------------------------------------------------------------------
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def related_symptoms(request):
+    """
+    ?selected=a,b[&limit=10] -> the unselected symptoms that best narrow
+    down the disease, from the co-occurrence / P(symptom|disease) index
+    written by /train/ (built once from Training.csv if missing).
+    """
+    selected = [s for s in request.query_params.get("selected", "").split(",") if s.strip()]
+    try:
+        limit = max(1, min(int(request.query_params.get("limit", 10)), 100))
+    except ValueError:
+        return JsonResponse({"detail": "limit must be an integer."}, status=400)
+
+    if not os.path.exists(SYMPTOM_INDEX_PATH):
+        if not os.path.exists(TRAIN_CSV_PATH):
+            return JsonResponse({"detail": "Training.csv not found."}, status=400)
+        save_index(index_from_frame(load_training_frame(), exclude=METADATA_COLUMNS), SYMPTOM_INDEX_PATH)
+
+    return JsonResponse(related(load_index(SYMPTOM_INDEX_PATH), selected, limit=limit))
+
+
 # -------------------------------------------------------------------
 # MODEL SCORES
 # -------------------------------------------------------------------
@@ -322,6 +419,61 @@ def model_scores(request):
     return JsonResponse(data)
 
 
+# -------------------------------------------------------------------
+# MODEL VERSIONS + OFFLINE EVALUATION
+# -------------------------------------------------------------------
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def model_versions(request):
+    return JsonResponse({"versions": list_versions()})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def evaluate_model(request):
+    """
+    Replays a dataset through stored model versions (no /predict/ calls).
+    Query: version (default "active"), compare (second version, optional),
+    dataset ("training" = Training.csv, "log" = PredictionLog inputs),
+    k (top-k, default 5), refresh=1 to ignore the cached result.
+    """
+    params = request.query_params
+    version = params.get("version", "active")
+    other = params.get("compare")
+    refresh = params.get("refresh") == "1"
+
+    try:
+        k = int(params.get("k", 5))
+    except ValueError:
+        return JsonResponse({"detail": "k must be an integer."}, status=400)
+    if k < 1:
+        return JsonResponse({"detail": "k must be at least 1."}, status=400)
+
+    try:
+        check_version(version)
+        if other:
+            check_version(other)
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+
+    source = params.get("dataset", "training")
+    if source == "training":
+        if not os.path.exists(TRAIN_CSV_PATH):
+            return JsonResponse({"detail": "Training.csv not found."}, status=400)
+        dataset = EvalDataset.from_csv(TRAIN_CSV_PATH, name="training")
+    elif source == "log":
+        dataset = EvalDataset.from_prediction_log()
+    else:
+        return JsonResponse({"detail": "dataset must be 'training' or 'log'."}, status=400)
+
+    try:
+        if other:
+            return JsonResponse(compare(version, other, dataset, k=k, refresh=refresh))
+        return JsonResponse(summary(cached_evaluate(version, dataset, k=k, refresh=refresh)))
+    except (KeyError, ValueError) as e:
+        return JsonResponse({"detail": str(e).strip("'\"")}, status=400)
+
+
 # -------------------------------------------------------------------
 # SUBSYMPTOMS
 # -------------------------------------------------------------------
@@ -332,7 +484,21 @@ def subsymptoms(request):
     if not os.path.exists(SUBSYM_PATH):
         return JsonResponse({"detail": "subsymptoms.json missing"}, status=404)
 
-    with open(SUBSYM_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    return JsonResponse(load_subsymptoms(), safe=False)
 
-    return JsonResponse(data, safe=False)
+
+# -------------------------------------------------------------------
+# READINESS
+# -------------------------------------------------------------------
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def readiness(request):
+    """
+    200 once the startup warm-up (PREDICTOR_WARMUP) has loaded the model
+    and indexes, 503 while it is still running or was skipped at startup
+    (this probe then starts it). For load-balancer / orchestrator
+    readiness probes.
+    """
+    warmup.start_if_skipped()
+    state = warmup.status()
+    return JsonResponse(state, status=200 if state["ready"] else 503)
@@ -0,0 +1,251 @@
+import gc
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .paths import COLS_PATH, LE_PATH, MODEL_PATH, SUBSYM_PATH, SYMPTOM_INDEX_PATH, TRAIN_CSV_PATH
+
+logger = logging.getLogger(__name__)
+
+# PREDICTOR_WARMUP values
+MODES = ("off", "sync", "background")
+
+
+# -------------------------------------------------------------------
+# Readiness state (per process; copied into workers by a preloading fork)
+# -------------------------------------------------------------------
+_state_lock = threading.Lock()
+_state = {
+    "status": "pending",  # pending -> warming -> ready | disabled (mode off) | skipped (not a server)
+    "mode": None,
+    "seconds": None,
+    "model_version": None,
+    "steps": {},
+}
+
+
+def status():
+    with _state_lock:
+        return {**_state, "ready": _state["status"] in ("ready", "disabled"), "steps": dict(_state["steps"])}
+
+
+def _set(**fields):
+    with _state_lock:
+        _state.update(fields)
+
+
+def _step(name, fn):
+    start = time.perf_counter()
+    try:
+        result = fn()
+    except Exception as e:
+        logger.exception("warm-up step %s failed", name)
+        outcome = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        result = None
+    else:
+        outcome = {"ok": True, "skipped": result is False}
+    outcome["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    with _state_lock:
+        _state["steps"][name] = outcome
+    return result
+
+
+# -------------------------------------------------------------------
+# Warm-up
+# -------------------------------------------------------------------
+def _dummy_inputs(cols, n=8, seed=0):
+    """A few symptom lists of increasing size, plus an empty one."""
+    rng = random.Random(seed)
+    rows = [[]]
+    for size in range(1, n):
+        rows.append(rng.sample(cols, k=min(len(cols), size)))
+    return rows
+
+
+def warm_up():
+    """
+    Load everything the request paths would otherwise load lazily: the
+    typed Training.csv frame, the active model bundle (classifier, columns,
+    class metadata), the related-symptoms index (built if missing) and
+    subsymptoms.json; then push a few dummy rows through predict_proba /
+    top_k and related() so sklearn / numpy code paths and allocator pools
+    are hot.
+
+    Steps with missing artifacts are skipped; failing steps are logged and
+    reported but do not block readiness (requests fall back to lazy loading).
+    """
+    # imported here so manage.py commands, which skip warm-up, don't pay for pandas / sklearn
+    from .dataset import load_subsymptoms, load_training_frame
+    from .inference import load_bundle, top_k
+    from .symptom_index import index_from_frame, load_index, related, save_index
+    from .training import METADATA_COLUMNS
+
+    _set(status="warming", steps={})
+    start = time.perf_counter()
+
+    _step("training_frame", lambda: os.path.exists(TRAIN_CSV_PATH) and load_training_frame() is not None)
+
+    def model():
+        if not (os.path.exists(MODEL_PATH) and os.path.exists(COLS_PATH) and os.path.exists(LE_PATH)):
+            return False
+        return load_bundle(MODEL_PATH, COLS_PATH, LE_PATH, TRAIN_CSV_PATH)
+
+    bundle = _step("model", model)
+    if bundle:
+        _set(model_version=bundle.version)
+
+        def predictions():
+            rows = _dummy_inputs(bundle.cols)
+            for r in rows:
+                probs = bundle.predict_proba([r])
+                idx, vals, mask = top_k(probs, getattr(settings, "PREDICT_TOP_K", 5))
+                bundle.classes.rows(idx[0], vals[0], mask[0])
+            bundle.predict_proba(rows)  # batch path
+            return True
+
+        _step("predictions", predictions)
+
+    def symptom_index():
+        if not os.path.exists(SYMPTOM_INDEX_PATH):
+            if not os.path.exists(TRAIN_CSV_PATH):
+                return False
+            # same fallback as the related-symptoms view, done before traffic arrives
+            save_index(index_from_frame(load_training_frame(), exclude=METADATA_COLUMNS), SYMPTOM_INDEX_PATH)
+        index = load_index(SYMPTOM_INDEX_PATH)
+        related(index, [], limit=5)
+        related(index, index["symptoms"][:2], limit=5)
+        return True
+
+    _step("symptom_index", symptom_index)
+    _step("subsymptoms", lambda: os.path.exists(SUBSYM_PATH) and load_subsymptoms() is not None)
+
+    _set(status="ready", seconds=round(time.perf_counter() - start, 3))
+    logger.info("predictor warm-up finished in %.2fs", time.perf_counter() - start)
+
+
+# -------------------------------------------------------------------
+# Startup hook
+# -------------------------------------------------------------------
+def _management_command(argv):
+    """The subcommand when argv is manage.py / django-admin / python -m django, else None."""
+    if not argv:
+        return None
+    prog = os.path.basename(argv[0])
+    if prog == "__main__.py":
+        # python -m <package>: only Django's own entry point is a management command
+        if os.path.basename(os.path.dirname(argv[0])) != "django":
+            return None
+    elif prog not in ("manage.py", "django-admin", "django-admin.py"):
+        return None
+    return argv[1] if len(argv) > 1 else ""
+
+
+def _serving_process(argv=None):
+    """
+    False for manage.py / django-admin commands other than runserver
+    (migrate, shell, test, ...) and for runserver's autoreload watcher
+    process; True otherwise, i.e. under any WSGI/ASGI server however it is
+    launched (gunicorn, python -m uvicorn, uwsgi, ...).
+    """
+    argv = sys.argv if argv is None else argv
+    command = _management_command(argv)
+    if command is None:
+        return True
+    if command != "runserver":
+        return False
+    return "--noreload" in argv or os.environ.get("RUN_MAIN") == "true"
+
+
+# modules whose loader locks the warm-up thread may hold at fork time
+_LOCKS = {
+    "DiseasePredictor.dataset": ("_memo_lock", "_subsym_lock"),
+    "DiseasePredictor.inference": ("_bundle_lock",),
+    "DiseasePredictor.symptom_index": ("_index_lock",),
+}
+_fork_hook_registered = False
+
+
+def _after_fork_in_child():
+    """
+    gunicorn --preload forks workers from the process that started the
+    background thread. The thread does not survive the fork but any lock
+    it held does, so give the child fresh locks (the caches behind them are
+    only ever assigned complete) and, if warm-up had not finished, run it
+    again in this worker.
+    """
+    global _state_lock
+    _state_lock = threading.Lock()
+    for module_name, names in _LOCKS.items():
+        module = sys.modules.get(module_name)
+        for name in names if module is not None else ():
+            setattr(module, name, threading.Lock())
+
+    if _state["status"] == "warming":
+        threading.Thread(target=warm_up, name="predictor-warmup", daemon=True).start()
+
+
+def _register_fork_hook():
+    global _fork_hook_registered
+    if not _fork_hook_registered and hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+        _fork_hook_registered = True
+
+
+def start(mode=None):
+    """
+    Called from DiseasePredictorConfig.ready().
+
+      off         no warm-up; readiness reports ready at once
+      sync        warm up before returning; use with gunicorn --preload so
+                  the loaded model is shared copy-on-write by all workers
+                  (objects are moved out of the GC's reach with gc.freeze()
+                  so collections in workers don't dirty the shared pages)
+      background  warm up in a daemon thread; readiness reports 503 until done
+                  (a worker forked before it finishes warms up on its own)
+
+    sync / background are skipped outside a server (manage.py commands other
+    than runserver); readiness then reports 503 and the first probe starts a
+    background warm-up.
+    """
+    mode = mode or getattr(settings, "PREDICTOR_WARMUP", "background")
+    if mode not in MODES:
+        raise ImproperlyConfigured(f"PREDICTOR_WARMUP must be one of {MODES}, got {mode!r}")
+    _set(mode=mode)
+
+    if mode == "off":
+        _set(status="disabled")
+        return
+    if not _serving_process():
+        # nothing is warm, so never report ready; should this process answer
+        # a readiness probe after all, the probe starts the warm-up
+        _set(status="skipped")
+        return
+
+    if mode == "sync":
+        warm_up()
+        gc.collect()
+        gc.freeze()
+        return
+
+    _set(status="warming")
+    _start_background()
+
+
+def _start_background():
+    _register_fork_hook()
+    threading.Thread(target=warm_up, name="predictor-warmup", daemon=True).start()
+
+
+def start_if_skipped():
+    """Run a warm-up that start() skipped, in the background; called by the readiness view."""
+    with _state_lock:
+        if _state["status"] != "skipped":
+            return
+        _state["status"] = "warming"
+    _start_background()
@@ -32,20 +32,46 @@ const ContactDoctor = () => {
   const [doctors, setDoctors] = useState(null);
   const [speciality, setSpeciality] = useState(null);
   const doctorType = useRef("All");
+  const requestId = useRef(0);
 
-  const fetchData = async (type = doctorType.current) => {
-    setDoctors(null);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // endpoint is cursor-paginated: { next, previous, results }
+  const fetchPage = async (url, current, append) => {
     try {
-      const encoded = type && type !== "All" ? encodeURIComponent(type) : "";
-      const url = `http://127.0.0.1:8000/api/accounts/doctors/?specialization=${encoded}`;
       const res = await axios.get(url);
-      setDoctors(Array.isArray(res.data) ? res.data : []);
+      if (current !== requestId.current) return; // a newer search replaced this one
+      const page = Array.isArray(res.data) ? res.data : res.data?.results ?? [];
+      setDoctors((prev) => (append ? [...(prev ?? []), ...page] : page));
+      setNextUrl(Array.isArray(res.data) ? null : res.data?.next ?? null);
     } catch (err) {
       console.error("fetch doctors error:", err);
-      setDoctors([]);
+      if (current !== requestId.current) return;
+      if (append) setNextUrl(null);
+      else setDoctors([]);
     }
   };
 
+  const fetchData = async (type = doctorType.current) => {
+    const current = ++requestId.current;
+    setDoctors(null);
+    setNextUrl(null);
+    const encoded = type && type !== "All" ? encodeURIComponent(type) : "";
+    await fetchPage(
+      `http://127.0.0.1:8000/api/accounts/doctors/?specialization=${encoded}`,
+      current,
+      false
+    );
+  };
+
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    await fetchPage(nextUrl, requestId.current, true);
+    setLoadingMore(false);
+  };
+
   useEffect(() => {
     fetchData("All");
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -181,7 +207,20 @@ const ContactDoctor = () => {
               </p>
             </div>
           ) : (
-            <DoctorProfile doctors={doctors} />
+            <>
+              <DoctorProfile doctors={doctors} />
+              {nextUrl && (
+                <div className="flex justify-center mt-8">
+                  <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="px-6 py-3 rounded-xl bg-gradient-to-r from-purple-600 to-pink-600 text-white font-semibold hover:shadow-xl hover:scale-105 transition-all whitespace-nowrap disabled:opacity-60 disabled:hover:scale-100"
+                  >
+                    {loadingMore ? "Loading..." : "Load more"}
+                  </button>
+                </div>
+              )}
+            </>
           )}
         </div>
       </div>